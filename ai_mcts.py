@@ -0,0 +1,166 @@
+"""
+IA alternativa: Monte Carlo Tree Search (UCT).
+
+Como los dos mazos son visibles y tienen orden fijo, el juego es determinista
+y de información perfecta: cada simulación se juega sobre una copia del estado
+con `GameState.apply_packed`, sin muestrear cartas ocultas.
+
+Mismo punto de entrada que `ai_minimax`: `choose_ai_move(state)`.
+"""
+import math
+import random
+import threading
+import time
+from typing import List, Optional
+
+import config
+from ai_minimax import SearchCancelled, SearchStats, evaluate_state
+from game_models import GameState, Move
+
+
+class MCTSNode:
+    """Nodo del árbol. `wins` se cuenta para quien hizo la jugada que lleva aquí."""
+
+    __slots__ = ("move", "parent", "children", "untried", "player_just_moved", "visits", "wins")
+
+    def __init__(self, state: GameState, move: Optional[int] = None,
+                 parent: Optional["MCTSNode"] = None, player_just_moved: Optional[str] = None) -> None:
+        self.move = move
+        self.parent = parent
+        self.children: List["MCTSNode"] = []
+        self.untried: List[Optional[int]] = _legal_moves(state)
+        self.player_just_moved = player_just_moved
+        self.visits = 0
+        self.wins = 0.0
+
+    def select_child(self, exploration: float) -> "MCTSNode":
+        """Hijo con mayor UCT: media de victorias + término de exploración."""
+        log_n = math.log(self.visits)
+        return max(self.children,
+                   key=lambda c: c.wins / c.visits + exploration * math.sqrt(log_n / c.visits))
+
+
+def _legal_moves(state: GameState) -> List[Optional[int]]:
+    """Jugadas (empaquetadas) de un nodo: si no hay ninguna, la única opción es pasar (None)."""
+    if state.finished:
+        return []
+    return state.valid_moves_packed() or [None]
+
+
+def _play(state: GameState, move: Optional[int]) -> None:
+    if move is None:
+        state.pass_turn()
+    else:
+        state.apply_packed(move)
+
+
+def _result_for(state: GameState, player: str) -> float:
+    """Resultado de la simulación para `player`: 1 gana, 0 pierde, 0.5 empate.
+
+    Si la simulación se cortó antes del final, se estima con evaluate_state.
+    """
+    if state.finished:
+        if state.winner == "draw":
+            return 0.5
+        return 1.0 if state.winner == player else 0.0
+    score = evaluate_state(state)
+    if player == "player":
+        score = -score
+    return 1.0 / (1.0 + math.exp(-score / config.MCTS_EVAL_SCALE))
+
+
+def _rollout(state: GameState, rng: random.Random, max_plies: int) -> None:
+    """Simulación ligera: jugadas al azar hasta el final o `max_plies`."""
+    for _ in range(max_plies):
+        if state.finished:
+            return
+        moves = state.valid_moves_packed()
+        if moves:
+            state.apply_packed(moves[rng.randrange(len(moves))])
+        else:
+            state.pass_turn()
+
+
+def mcts_search(state: GameState, iterations: int = 0, time_ms: float = 0,
+                exploration: float = 1.41, rollout_depth: int = 40,
+                rng: Optional[random.Random] = None,
+                stop_event: Optional[threading.Event] = None) -> MCTSNode:
+    """Construye el árbol UCT desde `state` y devuelve la raíz.
+
+    El presupuesto es `iterations` simulaciones o, si `time_ms` > 0, ese tiempo.
+    """
+    if rng is None:
+        rng = random.Random()
+    root = MCTSNode(state)
+    deadline = time.perf_counter() + time_ms / 1000.0 if time_ms > 0 else None
+    done = 0
+    while True:
+        if deadline is not None:
+            if time.perf_counter() >= deadline and done > 0:
+                break
+        elif done >= iterations:
+            break
+        if stop_event is not None and stop_event.is_set():
+            raise SearchCancelled()
+
+        node = root
+        sim = state.clone()
+
+        # 1. Selección
+        while not node.untried and node.children:
+            node = node.select_child(exploration)
+            _play(sim, node.move)
+
+        # 2. Expansión
+        if node.untried:
+            move = node.untried.pop(rng.randrange(len(node.untried)))
+            mover = sim.current_turn
+            _play(sim, move)
+            child = MCTSNode(sim, move, node, mover)
+            node.children.append(child)
+            node = child
+
+        # 3. Simulación
+        _rollout(sim, rng, rollout_depth)
+
+        # 4. Retropropagación
+        while node is not None:
+            node.visits += 1
+            if node.player_just_moved is not None:
+                node.wins += _result_for(sim, node.player_just_moved)
+            node = node.parent
+        done += 1
+    return root
+
+
+def choose_ai_move(state: GameState,
+                   stop_event: Optional[threading.Event] = None,
+                   side: str = "ai",
+                   stats: Optional[SearchStats] = None) -> Optional[Move]:
+    """Elige la jugada de la IA con MCTS (la más visitada). None = pasar.
+
+    MCTS juega siempre por quien tiene el turno; `side` se acepta para tener
+    la misma firma que ai_minimax.choose_ai_move. En `stats` los nodos son
+    las simulaciones hechas desde la raíz.
+    """
+    if not state.valid_moves_packed():
+        return None
+    t0 = time.perf_counter()
+    seed = config.MCTS_SEED
+    root = mcts_search(
+        state,
+        iterations=config.MCTS_ITERATIONS,
+        time_ms=config.MCTS_TIME_MS,
+        exploration=config.MCTS_EXPLORATION,
+        rollout_depth=config.MCTS_ROLLOUT_DEPTH,
+        rng=random.Random(seed) if seed is not None else None,
+        stop_event=stop_event,
+    )
+    best = max(root.children, key=lambda c: c.visits)
+    if stats is not None:
+        stats.mode = "mcts"
+        stats.nodes += root.visits
+        stats.expanded += 1
+        stats.children += len(root.children)
+        stats.elapsed = time.perf_counter() - t0
+    return Move.from_packed(best.move)
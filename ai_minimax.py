@@ -1,50 +1,120 @@
-from typing import Tuple, Optional
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterator, List, Set, Tuple, Optional
+
+import numpy as np
 
 import config
-from game_models import GameState, Move
+from endgame import EndgameTooLarge, is_endgame, solve_endgame
+from game_models import GameState, Move, Z_SEARCH, zobrist_key
+from move_ordering import MoveOrderer
+from transposition import TranspositionTable, EXACT, LOWER, UPPER
 
 
 def evaluate_state(state: GameState) -> int:
     """Función de evaluación muy simple:
-    Ventaja en LP + suma de ATK en el campo.
+    Ventaja en LP + suma de ATK en el campo, cada término multiplicado por su
+    peso (`config.AI_EVAL_LP_WEIGHT`, `config.AI_EVAL_ATK_WEIGHT`).
     Positivo favorece a la IA, negativo favorece al jugador.
+
+    Usa los totales que GameState mantiene al cambiar el campo, así que es O(1).
+    Con `config.DEBUG_EVAL_CHECK` se compara con `evaluate_state_full`.
     """
     ai = state.ai
     pl = state.player
+    score = (config.AI_EVAL_LP_WEIGHT * (ai.life_points - pl.life_points)
+             + config.AI_EVAL_ATK_WEIGHT * (ai.field_attack - pl.field_attack))
+    if config.DEBUG_EVAL_CHECK:
+        expected = evaluate_state_full(state)
+        if score != expected:
+            raise AssertionError(
+                f"Totales del campo desincronizados: {score} != {expected} "
+                f"(IA ATK {ai.field_attack}, jugador ATK {pl.field_attack})"
+            )
+    return score
+
+
+def evaluate_state_full(state: GameState) -> int:
+    """Misma evaluación que `evaluate_state`, recorriendo el campo carta a carta."""
+    ai = state.ai
+    pl = state.player
 
     # OJO: ahora usamos monster_zone en lugar de field
     ai_field_attack = sum(state.cards[cid].attack for cid in ai.monster_zone if cid is not None)
     pl_field_attack = sum(state.cards[cid].attack for cid in pl.monster_zone if cid is not None)
 
-    score = (ai.life_points - pl.life_points) + (ai_field_attack - pl_field_attack)
+    score = (config.AI_EVAL_LP_WEIGHT * (ai.life_points - pl.life_points)
+             + config.AI_EVAL_ATK_WEIGHT * (ai_field_attack - pl_field_attack))
     return score
 
 
-def minimax(state: GameState, depth: int, maximizing_for: str) -> Tuple[int, Optional[Move]]:
+# (LP IA, LP jugador, ATK en campo IA, ATK en campo jugador): lo que usa evaluate_state
+LeafFeatures = Tuple[int, int, int, int]
+
+
+def evaluate_batch(features: List[LeafFeatures]) -> List[int]:
+    """`evaluate_state` de varias posiciones a la vez, con los mismos valores.
+
+    A partir de `config.AI_BATCH_EVAL_NUMPY_MIN` posiciones se calcula con
+    NumPy (enteros de 64 bits: resultado exacto); con menos, el coste de crear
+    el array supera al del bucle y se usa Python.
+    """
+    w_lp, w_atk = config.AI_EVAL_LP_WEIGHT, config.AI_EVAL_ATK_WEIGHT
+    if len(features) >= config.AI_BATCH_EVAL_NUMPY_MIN:
+        f = np.array(features, dtype=np.int64)
+        return (w_lp * (f[:, 0] - f[:, 1]) + w_atk * (f[:, 2] - f[:, 3])).tolist()
+    return [w_lp * (ai_lp - pl_lp) + w_atk * (ai_atk - pl_atk)
+            for ai_lp, pl_lp, ai_atk, pl_atk in features]
+
+
+def minimax(state: GameState, depth: int, maximizing_for: str,
+            stats: Optional["SearchStats"] = None) -> Tuple[int, Optional[Move]]:
     """Minimax sin poda alfa-beta para simplificar.
     maximizing_for: "ai" o "player" (quién queremos que gane).
+    `stats`, si se pasa, acumula los contadores de la búsqueda.
     """
+    if stats is None:
+        stats = SearchStats()
+    # Se busca sobre una copia: el árbol se recorre con make_move/undo_move
+    value, move = _minimax(state.clone(), depth, maximizing_for, stats, 0)
+    stats.depth = max(stats.depth, depth)
+    return value, _unpack(move)
+
+
+def _unpack(move: Optional[int]) -> Optional[Move]:
+    """Jugada empaquetada de la búsqueda -> Move de la API pública."""
+    return None if move is None else Move.from_packed(move)
+
+
+def _minimax(state: GameState, depth: int, maximizing_for: str,
+             stats: "SearchStats", ply: int) -> Tuple[int, Optional[int]]:
+    stats.nodes += 1
     if depth == 0 or state.finished:
+        stats.leaf(ply)
         score = evaluate_state(state)
         # Si estamos maximizando para la IA, score tal cual.
         # Si maximizamos para el jugador, invertimos el signo.
         return (score if maximizing_for == "ai" else -score), None
 
-    moves = state.valid_moves()
+    moves = state.valid_moves_packed()
     if not moves:
+        stats.leaf(ply)
         score = evaluate_state(state)
         return (score if maximizing_for == "ai" else -score), None
+    stats.expanded += 1
+    stats.children += len(moves)
 
     # Nodo MAX si es turno del que maximizamos; MIN si es del otro
     if ((state.current_turn == "ai" and maximizing_for == "ai") or
             (state.current_turn == "player" and maximizing_for == "player")):
         # MAX
         best_value = float("-inf")
-        best_move: Optional[Move] = None
+        best_move: Optional[int] = None
         for m in moves:
-            next_state = state.clone()
-            next_state.apply_move(m)
-            value, _ = minimax(next_state, depth - 1, maximizing_for)
+            record = state.make_move(m)
+            value, _ = _minimax(state, depth - 1, maximizing_for, stats, ply + 1)
+            state.undo_move(record)
             if value > best_value:
                 best_value = value
                 best_move = m
@@ -52,18 +122,523 @@ def minimax(state: GameState, depth: int, maximizing_for: str) -> Tuple[int, Opt
     else:
         # MIN
         best_value = float("inf")
-        best_move: Optional[Move] = None
+        best_move: Optional[int] = None
         for m in moves:
-            next_state = state.clone()
-            next_state.apply_move(m)
-            value, _ = minimax(next_state, depth - 1, maximizing_for)
+            record = state.make_move(m)
+            value, _ = _minimax(state, depth - 1, maximizing_for, stats, ply + 1)
+            state.undo_move(record)
             if value < best_value:
                 best_value = value
                 best_move = m
         return best_value, best_move
 
 
-def choose_ai_move(state: GameState) -> Optional[Move]:
-    """Elige la mejor jugada para la IA usando Minimax."""
-    _, move = minimax(state, config.MINIMAX_DEPTH, maximizing_for="ai")
+def _leaf_value(state: GameState, maximizing_for: str) -> int:
+    score = evaluate_state(state)
+    return score if maximizing_for == "ai" else -score
+
+
+def _frontier_values(state: GameState, moves: List[int], ctx: "SearchContext",
+                     ply: int) -> List[int]:
+    """Valores de los hijos de un nodo a profundidad 1 (todos son hojas).
+
+    Las características de cada hija salen de `GameState.child_features`, sin
+    aplicar las jugadas, y se evalúan de una vez con `evaluate_batch`.
+    """
+    for _ in moves:
+        ctx.visit()
+    stats = ctx.stats
+    stats.leaves += len(moves)
+    if ply + 1 > stats.max_depth:
+        stats.max_depth = ply + 1
+    features = state.child_features(moves)
+    if config.DEBUG_EVAL_CHECK:
+        for m, f in zip(moves, features):
+            record = state.make_move(m)
+            expected = evaluate_state(state)
+            state.undo_move(record)
+            if evaluate_batch([f])[0] != expected:
+                raise AssertionError(f"child_features no coincide con la jugada {m}: {f}")
+    values = evaluate_batch(features)
+    if ctx.maximizing_for != "ai":
+        values = [-v for v in values]
+    return values
+
+
+def search_moves(state: GameState) -> List[int]:
+    """Jugadas que recorre la búsqueda: las de valid_moves sin las equivalentes
+    (`config.AI_DEDUP_MOVES`), en el mismo orden."""
+    moves = state.valid_moves_packed()
+    if config.AI_DEDUP_MOVES:
+        moves = list(state.distinct(moves))
+    return moves
+
+
+def _staged_moves(state: GameState, tt_move: Optional[int]) -> Iterator[int]:
+    """La jugada de la tabla primero y luego `GameState.iter_moves` sin repetirla."""
+    if tt_move is not None:
+        yield tt_move
+    moves = state.iter_moves()
+    if config.AI_DEDUP_MOVES:
+        moves = state.distinct(moves)
+    for m in moves:
+        if m != tt_move:
+            yield m
+
+
+def _tt_move_out(state: GameState, move: int) -> int:
+    """Jugada tal como se guarda en la tabla: con ids de carta si la clave es
+    canónica (en un estado equivalente cambian los índices)."""
+    return state.card_move(move) if config.AI_CANONICAL_KEYS else move
+
+
+def _tt_move_in(state: GameState, stored: int) -> Optional[int]:
+    """Jugada de la tabla en `state`, o None si no es válida aquí (colisión)."""
+    if config.AI_CANONICAL_KEYS:
+        return state.from_card_move(stored)
+    return stored if state.is_valid_packed(stored) else None
+
+
+def _search_key(state: GameState, maximizing_for: str) -> int:
+    # Con claves canónicas, los estados que solo difieren en el orden de la
+    # mano o en las casillas del campo comparten entrada (config.AI_CANONICAL_KEYS)
+    key = state.canonical_hash() if config.AI_CANONICAL_KEYS else state.zobrist_hash()
+    # El valor depende de para quién se maximiza: se mezcla en la clave
+    if maximizing_for == "player":
+        key ^= zobrist_key(0, Z_SEARCH, 0, 0)
+    return key
+
+
+class SearchTimeout(Exception):
+    """Se agotó el tiempo de la búsqueda a mitad de una iteración."""
+
+
+class SearchCancelled(Exception):
+    """La búsqueda se canceló desde fuera (p. ej. al reiniciar la partida)."""
+
+
+@dataclass
+class SearchStats:
+    """Contadores de una búsqueda: efecto de poda y ordenación, y lo que
+    muestra el panel de la GUI mientras la IA piensa."""
+    nodes: int = 0               # nodos visitados (incluye hojas)
+    leaves: int = 0              # posiciones evaluadas
+    expanded: int = 0            # nodos que generaron jugadas
+    children: int = 0            # hijos visitados desde esos nodos
+    max_depth: int = 0           # ply más profundo alcanzado
+    depth: int = 0               # profundidad nominal completada
+    cutoffs: int = 0             # podas alfa/beta
+    first_move_cutoffs: int = 0  # podas con la primera jugada probada
+    tt_probes: int = 0           # consultas a la tabla de transposición
+    tt_hits: int = 0             # consultas que encontraron la posición
+    elapsed: float = 0.0         # segundos de la decisión completa
+    mode: str = ""               # "alphabeta", "minimax", "parallel", "endgame" o "mcts"
+
+    @property
+    def first_move_cutoff_rate(self) -> float:
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    @property
+    def branching_factor(self) -> float:
+        """Hijos visitados por nodo expandido (tras la poda)."""
+        return self.children / self.expanded if self.expanded else 0.0
+
+    @property
+    def tt_hit_rate(self) -> float:
+        return self.tt_hits / self.tt_probes if self.tt_probes else 0.0
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.elapsed if self.elapsed > 0 else 0.0
+
+    def leaf(self, ply: int) -> None:
+        """Cuenta una posición evaluada a `ply` jugadas de la raíz."""
+        self.leaves += 1
+        if ply > self.max_depth:
+            self.max_depth = ply
+
+    def merge(self, other: "SearchStats") -> None:
+        """Suma los contadores de otra búsqueda (p. ej. la de un proceso hijo)."""
+        for name in ("nodes", "leaves", "expanded", "children", "cutoffs",
+                     "first_move_cutoffs", "tt_probes", "tt_hits"):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        self.max_depth = max(self.max_depth, other.max_depth)
+        self.depth = max(self.depth, other.depth)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Contadores y valores derivados, listos para JSON."""
+        data = asdict(self)
+        data["branching_factor"] = round(self.branching_factor, 3)
+        data["tt_hit_rate"] = round(self.tt_hit_rate, 4)
+        data["nodes_per_second"] = round(self.nodes_per_second)
+        return data
+
+
+@dataclass
+class SearchContext:
+    """Datos compartidos por todos los nodos de una búsqueda."""
+    maximizing_for: str
+    tt: Optional[TranspositionTable] = None
+    deadline: Optional[float] = None  # instante límite (time.perf_counter)
+    stop_event: Optional[threading.Event] = None  # activado = cancelar
+    orderer: Optional[MoveOrderer] = None  # None = orden de valid_moves
+    stats: SearchStats = field(default_factory=SearchStats)
+
+    def visit(self) -> None:
+        """Cuenta un nodo y, cada cierto número, revisa el reloj y la cancelación."""
+        self.stats.nodes += 1
+        if (self.stats.nodes & 127) == 0:
+            if self.stop_event is not None and self.stop_event.is_set():
+                raise SearchCancelled()
+            if self.deadline is not None and time.perf_counter() >= self.deadline:
+                raise SearchTimeout()
+
+    def is_max_node(self, state: GameState) -> bool:
+        return state.current_turn == self.maximizing_for
+
+
+def alphabeta(state: GameState, depth: int, maximizing_for: str,
+              alpha: float = float("-inf"), beta: float = float("inf"),
+              tt: Optional[TranspositionTable] = None,
+              stop_event: Optional[threading.Event] = None,
+              orderer: Optional[MoveOrderer] = None,
+              stats: Optional[SearchStats] = None) -> Tuple[float, Optional[Move]]:
+    """Minimax con poda alfa-beta.
+
+    Devuelve el mismo valor y la misma jugada que `minimax` (ante empates se
+    queda con la primera jugada en el orden de `valid_moves`), pero descarta
+    las ramas que no pueden cambiar la decisión.
+
+    Si se pasa una tabla de transposición `tt`, los nodos internos la consultan
+    antes de expandirse. Solo se reutilizan entradas de la misma profundidad
+    restante, así el resultado sigue siendo idéntico al de `minimax`.
+
+    Si `stop_event` se activa, la búsqueda lanza SearchCancelled.
+    `orderer` ordena las jugadas de los nodos internos (killer/histórica) y
+    `stats`, si se pasa, acumula los contadores de la búsqueda.
+    """
+    ctx = SearchContext(maximizing_for=maximizing_for, tt=tt, stop_event=stop_event,
+                        orderer=orderer, stats=stats if stats is not None else SearchStats())
+    probes, hits = (tt.probes, tt.hits) if tt is not None else (0, 0)
+    value, move = _search_root(state.clone(), depth, alpha, beta, ctx)
+    if tt is not None:
+        ctx.stats.tt_probes += tt.probes - probes
+        ctx.stats.tt_hits += tt.hits - hits
+    ctx.stats.depth = max(ctx.stats.depth, depth)
+    return value, _unpack(move)
+
+
+def _search_root(state: GameState, depth: int, alpha: float, beta: float,
+                 ctx: SearchContext, first: Optional[int] = None) -> Tuple[float, Optional[int]]:
+    """Nodo raíz de alfa-beta.
+
+    Las jugadas pueden probarse en otro orden (`first` va primero), pero ante
+    empates gana la primera según `valid_moves`: a las jugadas anteriores a la
+    mejor actual se les abre la ventana en 1 punto (los valores son enteros)
+    para que un empate devuelva su valor exacto y no una cota.
+    """
+    ctx.visit()
+    if depth == 0 or state.finished:
+        ctx.stats.leaf(0)
+        return _leaf_value(state, ctx.maximizing_for), None
+
+    moves = search_moves(state)
+    if not moves:
+        ctx.stats.leaf(0)
+        return _leaf_value(state, ctx.maximizing_for), None
+
+    if ctx.orderer is not None:
+        ordered = ctx.orderer.order(state, moves, 0, first)
+        order = sorted(range(len(moves)), key=lambda i: ordered.index(moves[i]))
+    else:
+        order = list(range(len(moves)))
+        if first is not None and first in moves:
+            i = moves.index(first)
+            order.remove(i)
+            order.insert(0, i)
+
+    # Profundidad 1: las hijas son hojas y su valor exacto no depende de la ventana
+    leaves = _frontier_values(state, moves, ctx, 0) if depth == 1 and config.AI_BATCH_EVAL else None
+
+    maximizing = ctx.is_max_node(state)
+    best_value = float("-inf") if maximizing else float("inf")
+    best_idx = len(moves)
+    tried = 0
+    for i in order:
+        tried += 1
+        if leaves is None:
+            record = state.make_move(moves[i])
+        if maximizing:
+            a = alpha - 1 if i < best_idx else alpha
+            value = leaves[i] if leaves is not None else _alphabeta(state, depth - 1, a, beta, ctx, 1)[0]
+            if value > best_value or (value == best_value and i < best_idx):
+                best_value, best_idx = value, i
+            alpha = max(alpha, best_value)
+        else:
+            b = beta + 1 if i < best_idx else beta
+            value = leaves[i] if leaves is not None else _alphabeta(state, depth - 1, alpha, b, ctx, 1)[0]
+            if value < best_value or (value == best_value and i < best_idx):
+                best_value, best_idx = value, i
+            beta = min(beta, best_value)
+        if leaves is None:
+            state.undo_move(record)
+        if alpha >= beta:
+            break
+    ctx.stats.expanded += 1
+    ctx.stats.children += len(moves) if leaves is not None else tried
+    return best_value, moves[best_idx]
+
+
+def _alphabeta(state: GameState, depth: int, alpha: float, beta: float,
+               ctx: SearchContext, ply: int) -> Tuple[float, Optional[int]]:
+    ctx.visit()
+    if depth == 0 or state.finished:
+        ctx.stats.leaf(ply)
+        return _leaf_value(state, ctx.maximizing_for), None
+
+    # Las jugadas se generan después de consultar la tabla (que puede bastar)
+    if not state.has_moves():
+        ctx.stats.leaf(ply)
+        return _leaf_value(state, ctx.maximizing_for), None
+
+    tt = ctx.tt
+    key = 0
+    tt_move: Optional[int] = None
+    alpha_orig, beta_orig = alpha, beta
+    if tt is not None:
+        key = _search_key(state, ctx.maximizing_for)
+        entry = tt.probe(key)
+        if entry is not None and entry[4] is not None:
+            tt_move = _tt_move_in(state, entry[4])
+        if entry is not None and entry[1] == depth:
+            value, flag = entry[2], entry[3]
+            if flag == EXACT:
+                return value, tt_move
+            if flag == LOWER and value > alpha:
+                alpha = value
+            elif flag == UPPER and value < beta:
+                beta = value
+            if alpha >= beta:
+                return value, tt_move
+
+    cut_index = -1
+    cut_move: Optional[int] = None
+    if depth == 1 and config.AI_BATCH_EVAL:
+        # Nodo frontera: las hijas son hojas. Se evalúan todas juntas y el valor
+        # del nodo es exactamente el mejor de ellas, sin necesidad de ordenar.
+        moves = search_moves(state)
+        leaves = _frontier_values(state, moves, ctx, ply)
+        ctx.stats.expanded += 1
+        ctx.stats.children += len(moves)
+        # La poda se cuenta en la primera hija (en orden de generación) que la
+        # habría provocado, como en la búsqueda secuencial
+        if ctx.is_max_node(state):
+            best_value = max(leaves)
+            cut_index = next((i for i, v in enumerate(leaves) if v >= beta), -1)
+        else:
+            best_value = min(leaves)
+            cut_index = next((i for i, v in enumerate(leaves) if v <= alpha), -1)
+        best_move = moves[leaves.index(best_value)]
+        if cut_index >= 0:
+            cut_move = moves[cut_index]
+    else:
+        # Solo cambia el orden de prueba: el valor del nodo es el mismo
+        if ctx.orderer is not None:
+            moves = ctx.orderer.order(state, search_moves(state), ply, tt_move)
+        else:
+            # Sin ordenación se generan a demanda: tras una poda no se genera el resto
+            moves = _staged_moves(state, tt_move)
+
+        i = -1
+        if ctx.is_max_node(state):
+            # MAX
+            best_value = float("-inf")
+            best_move = None
+            for i, m in enumerate(moves):
+                record = state.make_move(m)
+                value, _ = _alphabeta(state, depth - 1, alpha, beta, ctx, ply + 1)
+                state.undo_move(record)
+                if value > best_value:
+                    best_value = value
+                    best_move = m
+                if best_value > alpha:
+                    alpha = best_value
+                if alpha >= beta:
+                    cut_index, cut_move = i, m
+                    break  # poda beta
+        else:
+            # MIN
+            best_value = float("inf")
+            best_move = None
+            for i, m in enumerate(moves):
+                record = state.make_move(m)
+                value, _ = _alphabeta(state, depth - 1, alpha, beta, ctx, ply + 1)
+                state.undo_move(record)
+                if value < best_value:
+                    best_value = value
+                    best_move = m
+                if best_value < beta:
+                    beta = best_value
+                if alpha >= beta:
+                    cut_index, cut_move = i, m
+                    break  # poda alfa
+        ctx.stats.expanded += 1
+        ctx.stats.children += i + 1
+
+    if cut_index >= 0:
+        ctx.stats.cutoffs += 1
+        if cut_index == 0:
+            ctx.stats.first_move_cutoffs += 1
+        if ctx.orderer is not None:
+            ctx.orderer.record_cutoff(state, cut_move, ply, depth)
+
+    if tt is not None:
+        if best_value <= alpha_orig:
+            flag = UPPER
+        elif best_value >= beta_orig:
+            flag = LOWER
+        else:
+            flag = EXACT
+        tt.store(key, depth, best_value, flag,
+                 None if best_move is None else _tt_move_out(state, best_move))
+    return best_value, best_move
+
+
+def iterative_deepening(state: GameState, maximizing_for: str, time_budget_ms: float,
+                        max_depth: int, tt: Optional[TranspositionTable] = None,
+                        stop_event: Optional[threading.Event] = None,
+                        orderer: Optional[MoveOrderer] = None,
+                        stats: Optional[SearchStats] = None
+                        ) -> Tuple[Optional[Move], int]:
+    """Alfa-beta a profundidad 1, 2, 3... hasta agotar `time_budget_ms`.
+
+    Devuelve la jugada de la última iteración completa y su profundidad.
+    La profundidad 1 siempre se completa para tener una jugada que devolver.
+    Cada iteración prueba primero la mejor jugada de la anterior; `orderer`
+    conserva lo aprendido entre iteraciones y `stats` suma todas ellas.
+    """
+    deadline = time.perf_counter() + time_budget_ms / 1000.0
+    # Una iteración cortada deja el estado a medias: se busca sobre una copia
+    state = state.clone()
+    if stats is None:
+        stats = SearchStats()
+    probes, hits = (tt.probes, tt.hits) if tt is not None else (0, 0)
+    best_move: Optional[int] = None
+    completed = 0
+    for depth in range(1, max_depth + 1):
+        ctx = SearchContext(maximizing_for=maximizing_for, tt=tt,
+                            deadline=deadline if depth > 1 else None,
+                            stop_event=stop_event, orderer=orderer, stats=stats)
+        try:
+            _, move = _search_root(state, depth, float("-inf"), float("inf"), ctx, first=best_move)
+        except SearchTimeout:
+            break
+        best_move, completed = move, depth
+        if move is None or time.perf_counter() >= deadline:
+            break
+    if tt is not None:
+        stats.tt_probes += tt.probes - probes
+        stats.tt_hits += tt.hits - hits
+    stats.depth = max(stats.depth, completed)
+    return _unpack(best_move), completed
+
+
+# Tabla compartida entre turnos: las claves cubren mazos completos, así que
+# sigue siendo válida al reiniciar la partida.
+_tt: Optional[TranspositionTable] = None
+
+
+def set_transposition_table(tt: Optional[TranspositionTable]) -> Optional[TranspositionTable]:
+    """Sustituye la tabla compartida y devuelve la anterior.
+
+    Los valores guardados dependen de la evaluación, así que quien alterne
+    configuraciones distintas (p. ej. el torneo) debe usar una tabla para cada una.
+    """
+    global _tt
+    previous, _tt = _tt, tt
+    return previous
+
+
+def get_transposition_table() -> Optional[TranspositionTable]:
+    """Tabla de transposición de la IA (None si está desactivada en config)."""
+    global _tt
+    if not config.USE_TRANSPOSITION_TABLE:
+        return None
+    if _tt is None:
+        _tt = TranspositionTable(config.TT_MAX_MB)
+    return _tt
+
+
+# Posiciones (clave de búsqueda) en las que el resolvedor de finales se rindió:
+# no se vuelve a intentar con ellas
+_endgame_failures: Set[int] = set()
+_ENDGAME_FAILURES_MAX = 10_000
+
+
+def _endgame_time_ms() -> float:
+    """Tiempo que puede usar el resolvedor de finales en este turno."""
+    if config.AI_TIME_BUDGET_MS > 0:
+        return min(config.ENDGAME_MAX_MS, config.AI_TIME_BUDGET_MS * config.ENDGAME_TIME_SHARE)
+    return config.ENDGAME_MAX_MS
+
+
+def choose_ai_move(state: GameState,
+                   stop_event: Optional[threading.Event] = None,
+                   side: str = "ai",
+                   stats: Optional[SearchStats] = None) -> Optional[Move]:
+    """Elige la mejor jugada para `side` ("ai" o "player") según
+    `config.AI_SEARCH_MODE`.
+
+    `stop_event` permite cancelar la búsqueda desde otro hilo (modo alfa-beta);
+    en ese caso se lanza SearchCancelled. `stats`, si se pasa, acumula los
+    contadores de la búsqueda (la GUI los lee mientras la búsqueda avanza).
+
+    Con pocas cartas en juego (`config.ENDGAME_THRESHOLD`) se resuelve el
+    final de forma exacta; si el árbol resulta demasiado grande o lento
+    (`config.ENDGAME_MAX_NODES`, `_endgame_time_ms`) se sigue con la búsqueda
+    normal, que con AI_TIME_BUDGET_MS usa el tiempo que quede.
+    """
+    if stats is None:
+        stats = SearchStats()
+    t0 = time.perf_counter()
+    if config.ENDGAME_SOLVER and is_endgame(state, config.ENDGAME_THRESHOLD):
+        key = _search_key(state, side)
+        if key not in _endgame_failures:
+            try:
+                result = solve_endgame(state, side, config.ENDGAME_MAX_NODES,
+                                       deadline=t0 + _endgame_time_ms() / 1000.0,
+                                       stop_event=stop_event)
+                stats.mode = "endgame"
+                stats.nodes += result.nodes
+                stats.elapsed = time.perf_counter() - t0
+                return result.move
+            except EndgameTooLarge:
+                if len(_endgame_failures) >= _ENDGAME_FAILURES_MAX:
+                    _endgame_failures.clear()
+                _endgame_failures.add(key)
+
+    stats.mode = config.AI_SEARCH_MODE
+    if config.AI_SEARCH_MODE == "minimax":
+        _, move = minimax(state, config.MINIMAX_DEPTH, maximizing_for=side, stats=stats)
+    elif config.AI_SEARCH_MODE == "parallel":
+        from ai_parallel import parallel_alphabeta
+        _, move = parallel_alphabeta(state, config.MINIMAX_DEPTH, side, stop_event=stop_event,
+                                     stats=stats)
+    elif config.AI_SEARCH_MODE == "alphabeta":
+        tt = get_transposition_table()
+        if tt is not None:
+            tt.new_search()
+        orderer = MoveOrderer() if config.AI_MOVE_ORDERING else None
+        if config.AI_TIME_BUDGET_MS > 0:
+            # Lo que no haya gastado el resolvedor de finales
+            budget = config.AI_TIME_BUDGET_MS - (time.perf_counter() - t0) * 1000.0
+            move, _ = iterative_deepening(state, side, max(budget, 1.0),
+                                          config.AI_MAX_DEPTH, tt=tt, stop_event=stop_event,
+                                          orderer=orderer, stats=stats)
+        else:
+            _, move = alphabeta(state, config.MINIMAX_DEPTH, maximizing_for=side,
+                                tt=tt, stop_event=stop_event, orderer=orderer, stats=stats)
+    else:
+        raise ValueError(f"AI_SEARCH_MODE desconocido: {config.AI_SEARCH_MODE!r}")
+    stats.elapsed = time.perf_counter() - t0
     return move
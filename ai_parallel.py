@@ -0,0 +1,209 @@
+"""
+Alfa-beta paralelo en la raíz.
+
+Las jugadas de la raíz se reparten entre un ProcessPoolExecutor; cada proceso
+busca el subárbol de una jugada con alfa-beta secuencial. Las tablas de
+cartas, fusiones y combates se envían una sola vez por proceso (en el inicializador);
+a cada tarea solo viajan los dos PlayerState y el turno. Con "spawn" cada
+proceso importa config de nuevo, así que el inicializador también le pasa los
+valores de `SEARCH_CONFIG` que tenga el proceso principal.
+
+Los procesos comparten la mejor cota de la raíz (alfa) en memoria compartida:
+cada tarea arranca con la mejor cota publicada hasta ese momento y publica su
+valor al terminar (solo si sigue siendo la búsqueda vigente). La ventana se
+abre 1 punto (los valores son enteros) para que los empates devuelvan su
+valor exacto y la jugada elegida sea la misma que la de `alphabeta`
+secuencial.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, Optional, Tuple
+
+import config
+from ai_minimax import (alphabeta, evaluate_state, get_transposition_table, search_moves,
+                        SearchCancelled, SearchStats)
+from combat import CombatTable
+from move_ordering import MoveOrderer
+from game_models import Card, FusionIndex, GameState, Move, PlayerState
+
+# (player, ai, current_turn, finished, winner): lo mínimo para rehacer un GameState
+Position = Tuple[PlayerState, PlayerState, str, bool, Optional[str]]
+
+# Valores de config que cambian la búsqueda de los trabajadores
+SEARCH_CONFIG = (
+    "AI_DEDUP_MOVES", "AI_CANONICAL_KEYS", "AI_BATCH_EVAL", "AI_BATCH_EVAL_NUMPY_MIN",
+    "AI_EVAL_LP_WEIGHT", "AI_EVAL_ATK_WEIGHT", "AI_MOVE_ORDERING",
+    "USE_TRANSPOSITION_TABLE", "TT_MAX_MB", "DEBUG_EVAL_CHECK", "MAX_MONSTERS",
+)
+
+# Estado global de cada proceso trabajador (fijado por _init_worker)
+_cards: Dict[int, Card] = {}
+_fusions: FusionIndex = FusionIndex()
+_combat: Optional[CombatTable] = None
+_shared_bound = None   # Array("d", [id de búsqueda, mejor valor de la raíz])
+_stop_event = None
+
+
+def search_config() -> Dict[str, object]:
+    """Valores actuales de `SEARCH_CONFIG`."""
+    return {name: getattr(config, name) for name in SEARCH_CONFIG}
+
+
+def _init_worker(cards, fusions, combat, settings, shared_bound, stop_event) -> None:
+    global _cards, _fusions, _combat, _shared_bound, _stop_event
+    for name, value in settings.items():
+        setattr(config, name, value)
+    _cards = cards
+    _fusions = fusions
+    _combat = combat
+    _shared_bound = shared_bound
+    _stop_event = stop_event
+
+
+def to_position(state: GameState) -> Position:
+    return (state.player, state.ai, state.current_turn, state.finished, state.winner)
+
+
+def from_position(position: Position, cards: Dict[int, Card],
+                  fusions: FusionIndex, combat: Optional[CombatTable] = None) -> GameState:
+    player, ai, current_turn, finished, winner = position
+    return GameState(cards=cards, fusions=fusions, player=player.clone(), ai=ai.clone(),
+                     current_turn=current_turn, finished=finished, winner=winner, combat=combat)
+
+
+def _search_root_move(search_id: int, position: Position, move_index: int, move: int,
+                      depth: int, maximizing_for: str) -> Tuple[int, float, SearchStats]:
+    """Tarea del trabajador: valor de la jugada `move` (la `move_index` de la raíz).
+
+    El valor se expresa desde el punto de vista de quien mueve en la raíz
+    (mayor = mejor para él), igual que la cota compartida. También devuelve
+    los contadores de la búsqueda del subárbol.
+    """
+    state = from_position(position, _cards, _fusions, _combat)
+    root_is_max = state.current_turn == maximizing_for
+    sign = 1 if root_is_max else -1
+    state.apply_packed(move)
+
+    with _shared_bound.get_lock():
+        bound = _shared_bound[1] - 1
+    tt = get_transposition_table()
+    if tt is not None:
+        tt.new_search()
+    orderer = MoveOrderer() if config.AI_MOVE_ORDERING else None
+    stats = SearchStats()
+    if root_is_max:
+        value, _ = alphabeta(state, depth - 1, maximizing_for, alpha=bound, tt=tt,
+                             stop_event=_stop_event, orderer=orderer, stats=stats)
+    else:
+        value, _ = alphabeta(state, depth - 1, maximizing_for, beta=-bound, tt=tt,
+                             stop_event=_stop_event, orderer=orderer, stats=stats)
+    value *= sign
+    with _shared_bound.get_lock():
+        if _shared_bound[0] == search_id and value > _shared_bound[1]:
+            _shared_bound[1] = value
+    return move_index, value, stats
+
+
+class ParallelSearcher:
+    """Pool de procesos reutilizable entre turnos.
+
+    El pool se crea la primera vez y se recrea solo si cambian las tablas de
+    cartas/fusiones (p. ej. otros archivos de datos) o los valores de
+    `SEARCH_CONFIG`.
+    """
+
+    def __init__(self, workers: int = 0) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self._mp = multiprocessing.get_context("spawn")
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._tables = None
+        self._shared_bound = None
+        self._stop_event = None
+        self._search_id = 0
+
+    def _ensure_pool(self, state: GameState) -> ProcessPoolExecutor:
+        settings = search_config()
+        tables = (state.cards, state.fusions, settings)
+        if self._pool is not None and self._tables != tables:
+            self.shutdown()
+        if self._pool is None:
+            self._shared_bound = self._mp.Array("d", [0.0, float("-inf")])
+            self._stop_event = self._mp.Event()
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=self._mp, initializer=_init_worker,
+                initargs=(state.cards, state.fusions, state.combat, settings,
+                          self._shared_bound, self._stop_event),
+            )
+            self._tables = tables
+        return self._pool
+
+    def search(self, state: GameState, depth: int, maximizing_for: str,
+               stop_event=None, stats: Optional[SearchStats] = None) -> Tuple[float, Optional[Move]]:
+        """Misma semántica que `alphabeta(state, depth, maximizing_for)`.
+
+        `stats` acumula los contadores de todos los procesos.
+        """
+        moves = search_moves(state)
+        if depth == 0 or state.finished or not moves:
+            score = evaluate_state(state)
+            return (score if maximizing_for == "ai" else -score), None
+
+        pool = self._ensure_pool(state)
+        self._search_id += 1
+        with self._shared_bound.get_lock():
+            self._shared_bound[0] = self._search_id
+            self._shared_bound[1] = float("-inf")
+        self._stop_event.clear()
+
+        position = to_position(state)
+        pending = {pool.submit(_search_root_move, self._search_id, position, i, m, depth,
+                               maximizing_for)
+                   for i, m in enumerate(moves)}
+        values: Dict[int, float] = {}
+        try:
+            while pending:
+                done, pending = wait(pending, timeout=0.05, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    i, value, child_stats = fut.result()
+                    values[i] = value
+                    if stats is not None:
+                        child_stats.max_depth += 1  # el subárbol empieza a un ply de la raíz
+                        stats.merge(child_stats)
+                if stop_event is not None and stop_event.is_set():
+                    raise SearchCancelled()
+        except BaseException:
+            self._stop_event.set()
+            for fut in pending:
+                fut.cancel()
+            raise
+
+        if stats is not None:
+            stats.nodes += 1
+            stats.expanded += 1
+            stats.children += len(moves)
+            stats.depth = max(stats.depth, depth)
+
+        # Mejor valor; ante empate, la primera jugada (como alfa-beta secuencial)
+        best_idx = max(range(len(moves)), key=lambda i: (values[i], -i))
+        sign = 1 if state.current_turn == maximizing_for else -1
+        return values[best_idx] * sign, Move.from_packed(moves[best_idx])
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        self._pool = None
+        self._tables = None
+
+
+_searcher: Optional[ParallelSearcher] = None
+
+
+def parallel_alphabeta(state: GameState, depth: int, maximizing_for: str,
+                       stop_event=None, stats: Optional[SearchStats] = None
+                       ) -> Tuple[float, Optional[Move]]:
+    """Alfa-beta paralelo en la raíz con el pool compartido (`config.AI_WORKERS`)."""
+    global _searcher
+    if _searcher is None:
+        _searcher = ParallelSearcher(config.AI_WORKERS)
+    return _searcher.search(state, depth, maximizing_for, stop_event=stop_event, stats=stats)
@@ -0,0 +1,99 @@
+"""
+Búsqueda de la IA fuera del hilo de renderizado.
+
+La GUI lanza la búsqueda con `start`, consulta `done` en cada cuadro (sin
+bloquear) y recoge la jugada con `take_result`. `cancel` descarta la búsqueda
+en curso, por ejemplo al reiniciar la partida. `stats` son los contadores de
+la última búsqueda lanzada y se pueden leer mientras avanza.
+"""
+import threading
+import time
+from typing import Optional
+
+from ai_minimax import SearchCancelled, SearchStats
+from engines import choose_ai_move_with_stats
+from game_models import GameState, Move
+
+
+class AIWorker:
+    """Ejecuta `choose_ai_move` (motor de config.AI_ENGINE) en un hilo aparte,
+    de una búsqueda a la vez."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event: Optional[threading.Event] = None
+        self._job = 0              # identifica la búsqueda vigente
+        self._done = False
+        self._result: Optional[Move] = None
+        self._error: Optional[BaseException] = None
+        self.stats: Optional[SearchStats] = None
+        self.started = 0.0         # time.perf_counter() al lanzar la última búsqueda
+
+    @property
+    def busy(self) -> bool:
+        """Hay una búsqueda lanzada cuyo resultado aún no se ha recogido."""
+        return self._thread is not None
+
+    def start(self, state: GameState) -> None:
+        """Empieza a buscar la jugada de la IA sobre una copia de `state`."""
+        if self.busy:
+            raise RuntimeError("Ya hay una búsqueda de la IA en curso")
+        with self._lock:
+            self._job += 1
+            job = self._job
+            self._done = False
+            self._result = None
+            self._error = None
+        self._stop_event = threading.Event()
+        self.stats = SearchStats()
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(
+            target=self._run, args=(job, state.clone(), self._stop_event, self.stats),
+            name="ai-search", daemon=True,
+        )
+        self._thread.start()
+
+    def _run(self, job: int, state: GameState, stop_event: threading.Event,
+             stats: SearchStats) -> None:
+        try:
+            move, _ = choose_ai_move_with_stats(state, stop_event=stop_event, stats=stats)
+            error = None
+        except SearchCancelled:
+            return
+        except Exception as exc:  # se relanza en el hilo de la GUI
+            move, error = None, exc
+        with self._lock:
+            # Una búsqueda cancelada no debe pisar el resultado de la siguiente
+            if job == self._job and not stop_event.is_set():
+                self._result = move
+                self._error = error
+                self._done = True
+
+    def done(self) -> bool:
+        """True si la búsqueda lanzada ya terminó (no bloquea)."""
+        with self._lock:
+            return self.busy and self._done
+
+    def take_result(self) -> Optional[Move]:
+        """Devuelve la jugada encontrada (None = pasar) y deja el worker libre."""
+        with self._lock:
+            if not (self.busy and self._done):
+                raise RuntimeError("La búsqueda de la IA no ha terminado")
+            move, error = self._result, self._error
+            self._thread = None
+            self._stop_event = None
+            self._done = False
+        if error is not None:
+            raise error
+        return move
+
+    def cancel(self) -> None:
+        """Cancela la búsqueda en curso (si la hay) sin esperar a que termine."""
+        with self._lock:
+            if self._stop_event is not None:
+                self._stop_event.set()
+            self._job += 1
+            self._thread = None
+            self._stop_event = None
+            self._done = False
@@ -0,0 +1 @@
+"""Benchmarks de la IA (ejecutar desde la raíz: python -m benchmarks.<nombre>)."""
@@ -0,0 +1,38 @@
+"""
+Nodos visitados por alfa-beta con y sin ordenación de jugadas.
+
+    python -m benchmarks.bench_ordering --depths 2 3 4 --positions 10
+"""
+import argparse
+import time
+
+from ai_minimax import SearchStats, alphabeta
+from benchmarks.positions import build_positions
+from move_ordering import MoveOrderer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--depths", type=int, nargs="+", default=[2, 3, 4])
+    parser.add_argument("--positions", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    positions = build_positions(args.positions, seed=args.seed)
+    print(f"{'prof.':<6}{'modo':<12}{'nodos':>10}{'podas':>9}{'1ª jugada':>11}{'tiempo (s)':>12}")
+    for depth in args.depths:
+        results = {}
+        for label, make_orderer in (("sin orden", lambda: None), ("ordenado", MoveOrderer)):
+            stats = SearchStats()
+            t0 = time.perf_counter()
+            results[label] = [alphabeta(s, depth, s.current_turn, orderer=make_orderer(), stats=stats)
+                              for s in positions]
+            elapsed = time.perf_counter() - t0
+            print(f"{depth:<6}{label:<12}{stats.nodes:>10}{stats.cutoffs:>9}"
+                  f"{stats.first_move_cutoff_rate:>10.0%}{elapsed:>12.3f}")
+        if results["sin orden"] != results["ordenado"]:
+            raise SystemExit(f"Profundidad {depth}: la ordenación cambió el resultado")
+
+
+if __name__ == "__main__":
+    main()
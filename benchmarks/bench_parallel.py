@@ -0,0 +1,47 @@
+"""
+Aceleración del alfa-beta paralelo en la raíz según el número de procesos.
+
+    python -m benchmarks.bench_parallel --depth 4 --positions 8 --workers 1 2 4
+"""
+import argparse
+import os
+import time
+
+from ai_minimax import alphabeta
+from ai_parallel import ParallelSearcher
+from benchmarks.positions import build_positions
+
+
+def main() -> None:
+    cpus = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--positions", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, 4, cpus} & set(range(1, cpus + 1))) or [1])
+    args = parser.parse_args()
+
+    positions = build_positions(args.positions, seed=args.seed)
+
+    t0 = time.perf_counter()
+    expected = [alphabeta(s, args.depth, s.current_turn) for s in positions]
+    sequential = time.perf_counter() - t0
+    print(f"Posiciones: {len(positions)}  profundidad: {args.depth}  núcleos: {cpus}")
+    print(f"{'modo':<14}{'tiempo (s)':>12}{'aceleración':>14}")
+    print(f"{'secuencial':<14}{sequential:>12.3f}{1.0:>14.2f}")
+
+    for workers in args.workers:
+        searcher = ParallelSearcher(workers)
+        searcher.search(positions[0], 1, positions[0].current_turn)  # arranca el pool
+        t0 = time.perf_counter()
+        results = [searcher.search(s, args.depth, s.current_turn) for s in positions]
+        elapsed = time.perf_counter() - t0
+        searcher.shutdown()
+        if results != expected:
+            raise SystemExit(f"{workers} procesos: el resultado difiere del secuencial")
+        print(f"{f'{workers} procesos':<14}{elapsed:>12.3f}{sequential / elapsed:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Rendimiento de choose_ai_move a profundidades 1-6 sobre posiciones fijas.
+
+    python -m benchmarks.bench_search --positions 20 --json hoy.json
+    python -m benchmarks.bench_search --baseline ayer.json --threshold 0.10
+    python -m benchmarks.bench_search --position logs/positions.txt --depths 4 5
+
+Para cada profundidad mide nodos, nodos por segundo, percentiles del tiempo
+por jugada y pico de memoria (tracemalloc, en una pasada aparte para no
+falsear los tiempos). Cada profundidad empieza con una tabla de
+transposición vacía, así los nodos son reproducibles entre ejecuciones.
+Cada búsqueda se repite --repeat veces y cuenta la más rápida.
+
+Con --baseline compara con un JSON anterior y sale con código 1 si los
+nodos o la memoria empeoran más que --threshold (0.10 = un 10 %). Los tiempos
+tienen ruido incluso repitiendo las búsquedas y solo son comparables en la
+misma máquina: solo se vigilan si se pasa --time-threshold (p. ej. 0.30).
+"""
+import argparse
+import gc
+import hashlib
+import json
+import platform
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import config
+from ai_minimax import SearchStats, choose_ai_move, set_transposition_table
+from benchmarks.positions import build_corpus, load_corpus
+from game_models import GameState
+from transposition import TranspositionTable
+
+# Métricas que se vigilan en --baseline (en todas, más es peor)
+REGRESSION_METRICS = ("nodes", "peak_kib")
+TIME_METRICS = ("mean_ms", "p90_ms")
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Percentil `q` (0-100) con interpolación lineal."""
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * q / 100
+    lo = int(pos)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+
+
+def _configure(depth: int) -> Dict[str, object]:
+    """Fija la búsqueda a `depth` (alfa-beta sin límite de tiempo); devuelve lo que había."""
+    overrides = {"MINIMAX_DEPTH": depth, "AI_SEARCH_MODE": "alphabeta", "AI_TIME_BUDGET_MS": 0}
+    saved = {key: getattr(config, key) for key in overrides}
+    for key, value in overrides.items():
+        setattr(config, key, value)
+    return saved
+
+
+def bench_depth(corpus: List[Tuple[str, GameState]], depth: int,
+                memory: bool = True, repeat: int = 1) -> Dict[str, object]:
+    saved = _configure(depth)
+    previous = set_transposition_table(None)
+    try:
+        stats = SearchStats()
+        times: List[float] = [float("inf")] * len(corpus)
+        moves: List[str] = []
+        # Cada pasada con una tabla vacía: las repeticiones buscan lo mismo
+        # y solo se suman los nodos de la primera
+        for r in range(repeat):
+            set_transposition_table(TranspositionTable(config.TT_MAX_MB))
+            for i, (_, state) in enumerate(corpus):
+                t0 = time.perf_counter()
+                move = choose_ai_move(state, side=state.current_turn,
+                                      stats=stats if r == 0 else None)
+                times[i] = min(times[i], time.perf_counter() - t0)
+                if r == 0:
+                    moves.append(repr(move))
+
+        peak = 0
+        if memory:
+            set_transposition_table(TranspositionTable(config.TT_MAX_MB))
+            gc.collect()
+            tracemalloc.start()
+            for _, state in corpus:
+                tracemalloc.reset_peak()
+                base = tracemalloc.get_traced_memory()[0]
+                choose_ai_move(state, side=state.current_turn)
+                peak = max(peak, tracemalloc.get_traced_memory()[1] - base)
+            tracemalloc.stop()
+    finally:
+        set_transposition_table(previous)
+        for key, value in saved.items():
+            setattr(config, key, value)
+
+    total = sum(times)
+    ms = [1000 * t for t in times]
+    return {
+        "positions": len(corpus),
+        "nodes": stats.nodes,
+        "seconds": round(total, 6),
+        "nps": round(stats.nodes / total) if total > 0 else 0,
+        "mean_ms": round(sum(ms) / len(ms), 4),
+        "p50_ms": round(percentile(ms, 50), 4),
+        "p90_ms": round(percentile(ms, 90), 4),
+        "p99_ms": round(percentile(ms, 99), 4),
+        "max_ms": round(max(ms), 4),
+        "peak_kib": round(peak / 1024, 1),
+        # Resumen de las jugadas elegidas: cambia si cambia el resultado de la búsqueda
+        "moves": hashlib.sha1("\n".join(moves).encode()).hexdigest()[:12],
+    }
+
+
+def compare(report: Dict, baseline: Dict, threshold: float,
+            time_threshold: Optional[float] = None) -> List[str]:
+    """Métricas que empeoran respecto a `baseline` más que `threshold` (los
+    tiempos, más que `time_threshold` y solo si se da)."""
+    regressions = []
+    for depth, new in report["depths"].items():
+        old = baseline["depths"].get(depth)
+        if old is None:
+            continue
+        if old.get("positions") != new["positions"]:
+            regressions.append(f"profundidad {depth}: distinto número de posiciones, no comparable")
+            continue
+        if old.get("moves") != new["moves"]:
+            print(f"aviso: profundidad {depth}: las jugadas elegidas cambiaron")
+        limits = [(m, threshold) for m in REGRESSION_METRICS]
+        if time_threshold is not None:
+            limits += [(m, time_threshold) for m in TIME_METRICS]
+        for metric, limit in limits:
+            before, after = old.get(metric, 0), new[metric]
+            if before > 0 and after > before * (1 + limit):
+                regressions.append(f"profundidad {depth}: {metric} {before} -> {after} "
+                                   f"(+{after / before - 1:.1%})")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--depths", type=int, nargs="+", default=[1, 2, 3, 4, 5, 6])
+    parser.add_argument("--positions", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--position", action="append", metavar="POSICIÓN|ARCHIVO",
+                        help="posición en notación (o archivo de posiciones) en lugar del corpus")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="veces que se repite cada búsqueda (cuenta la más rápida)")
+    parser.add_argument("--no-memory", action="store_true", help="omitir la pasada de tracemalloc")
+    parser.add_argument("--json", metavar="RUTA", help="guardar los resultados en JSON")
+    parser.add_argument("--baseline", metavar="RUTA", help="JSON anterior con el que comparar")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="empeoramiento relativo tolerado con --baseline (nodos, memoria)")
+    parser.add_argument("--time-threshold", type=float,
+                        help="vigilar también los tiempos con --baseline, con este umbral")
+    args = parser.parse_args()
+    if args.repeat < 1:
+        parser.error("--repeat debe ser al menos 1")
+
+    try:
+        corpus = (load_corpus(args.position) if args.position
+                  else build_corpus(args.positions, seed=args.seed))
+    except ValueError as exc:
+        parser.error(str(exc))
+    bench_depth(corpus, 1, memory=False)  # calienta cachés (filas de la tabla de combate...)
+
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "positions": [name for name, _ in corpus],
+        "depths": {},
+    }
+    print(f"Posiciones: {len(corpus)}  semilla: {args.seed}")
+    print(f"{'prof.':<6}{'nodos':>10}{'nodos/s':>10}{'media':>9}{'p50':>9}{'p90':>9}"
+          f"{'p99':>9}{'máx (ms)':>10}{'pico KiB':>10}")
+    for depth in args.depths:
+        r = bench_depth(corpus, depth, memory=not args.no_memory, repeat=args.repeat)
+        report["depths"][str(depth)] = r
+        print(f"{depth:<6}{r['nodes']:>10}{r['nps']:>10}{r['mean_ms']:>9.2f}{r['p50_ms']:>9.2f}"
+              f"{r['p90_ms']:>9.2f}{r['p99_ms']:>9.2f}{r['max_ms']:>10.2f}{r['peak_kib']:>10.1f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold, args.time_threshold)
+        for line in regressions:
+            print(f"REGRESIÓN: {line}")
+        if regressions:
+            raise SystemExit(1)
+        times = ("sin vigilar" if args.time_threshold is None
+                 else f"{args.time_threshold:.0%}")
+        print(f"Sin regresiones respecto a {args.baseline} (umbral {args.threshold:.0%}, "
+              f"tiempos {times})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Coste de la representación de GameState: copia y memoria.
+
+    python -m benchmarks.bench_state --positions 10 --depth 4
+"""
+import argparse
+import gc
+import timeit
+import tracemalloc
+
+from ai_minimax import alphabeta
+from benchmarks.positions import build_positions
+from persistent_state import FrozenGameState
+
+
+def _history_memory(positions, plies: int):
+    """Bytes por estado al guardar el historial de `plies` jugadas desde cada
+    posición: copias con clone() frente a estados persistentes."""
+    results = []
+    for persistent in (False, True):
+        gc.collect()
+        tracemalloc.start()
+        base = tracemalloc.get_traced_memory()[0]
+        history = []
+        for s in positions:
+            state = FrozenGameState.freeze(s) if persistent else s.clone()
+            history.append(state)
+            for _ in range(plies):
+                moves = state.valid_moves_packed()
+                if state.finished or not moves:
+                    break
+                if persistent:
+                    state = state.apply_packed(moves[0])
+                else:
+                    state = state.clone()
+                    state.apply_packed(moves[0])
+                history.append(state)
+        results.append((tracemalloc.get_traced_memory()[0] - base) / len(history))
+        tracemalloc.stop()
+        del history
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--positions", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--copies", type=int, default=10_000)
+    parser.add_argument("--plies", type=int, default=30, help="jugadas del historial guardado")
+    args = parser.parse_args()
+
+    positions = build_positions(args.positions, seed=args.seed)
+
+    # 1. Tiempo de clone()
+    n = 20_000
+    total = sum(timeit.timeit(s.clone, number=n) for s in positions)
+    clone_us = total / (n * len(positions)) * 1e6
+
+    # 2. Memoria por estado copiado (lo que ocupa un nodo guardado)
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    copies = [positions[i % len(positions)].clone() for i in range(args.copies)]
+    per_state = (tracemalloc.get_traced_memory()[0] - base) / len(copies)
+    tracemalloc.stop()
+    del copies
+
+    # 3. Pico de memoria de una búsqueda a la profundidad pedida
+    gc.collect()
+    tracemalloc.start()
+    for s in positions:
+        alphabeta(s, args.depth, s.current_turn)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    # 4. Historial de partida: copias frente a estados persistentes
+    cloned, persistent = _history_memory(positions, args.plies)
+
+    print(f"Posiciones: {len(positions)}")
+    print(f"clone():                         {clone_us:8.2f} µs")
+    print(f"memoria por estado copiado:      {per_state:8.0f} bytes")
+    print(f"pico de memoria, profundidad {args.depth}:  {peak / 1024:8.1f} KiB")
+    print(f"historial ({args.plies} jugadas), clone():     {cloned:8.0f} bytes/estado")
+    print(f"historial ({args.plies} jugadas), persistente: {persistent:8.0f} bytes/estado")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Aciertos de la tabla de transposición con claves canónicas frente a claves
+de Zobrist del estado tal cual.
+
+    python -m benchmarks.bench_tt_keys --depths 3 4 5 --positions 10
+"""
+import argparse
+import time
+
+import config
+from ai_minimax import SearchStats, alphabeta
+from benchmarks.positions import build_positions
+from move_ordering import MoveOrderer
+from transposition import TranspositionTable
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--depths", type=int, nargs="+", default=[3, 4, 5])
+    parser.add_argument("--positions", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    positions = build_positions(args.positions, seed=args.seed)
+    original = config.AI_CANONICAL_KEYS
+    print(f"{'prof.':<6}{'claves':<11}{'consultas':>11}{'aciertos':>10}{'tasa':>7}"
+          f"{'nodos':>10}{'tiempo (s)':>12}")
+    try:
+        for depth in args.depths:
+            results = {}
+            rates = {}
+            for label, canonical in (("estado", False), ("canónicas", True)):
+                config.AI_CANONICAL_KEYS = canonical
+                tt = TranspositionTable(config.TT_MAX_MB)
+                stats = SearchStats()
+                t0 = time.perf_counter()
+                results[label] = [alphabeta(s, depth, s.current_turn, tt=tt,
+                                            orderer=MoveOrderer(), stats=stats)
+                                  for s in positions]
+                elapsed = time.perf_counter() - t0
+                rates[label] = tt.hits / tt.probes if tt.probes else 0.0
+                print(f"{depth:<6}{label:<11}{tt.probes:>11}{tt.hits:>10}{rates[label]:>7.1%}"
+                      f"{stats.nodes:>10}{elapsed:>12.3f}")
+            if results["estado"] != results["canónicas"]:
+                raise SystemExit(f"Profundidad {depth}: las claves canónicas cambiaron el resultado")
+            # Con 0 aciertos en claves del estado el cociente no tiene sentido
+            gain = 100 * (rates["canónicas"] - rates["estado"])
+            ratio = (f"x{rates['canónicas'] / rates['estado']:.2f}" if rates["estado"] > 0
+                     else "n/a")
+            print(f"{'':<6}mejora de la tasa de aciertos: {gain:+.1f} puntos ({ratio})")
+    finally:
+        config.AI_CANONICAL_KEYS = original
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Posiciones reproducibles para los benchmarks.
+
+Cada posición sale de una partida con semilla fija (mazos de
+`build_random_deck`) jugada unas cuantas jugadas con alfa-beta a profundidad 1
+para ambos bandos, así el corpus es idéntico en cada ejecución.
+
+También se pueden usar posiciones concretas en la notación de `notation.py`
+(p. ej. las capturadas en la GUI con la tecla P), con `load_corpus`.
+"""
+import os
+import random
+from typing import List, Tuple
+
+import config
+from ai_minimax import alphabeta
+from combat import CombatTable
+from game_models import GameState, create_initial_game_state, load_cards, load_fusions
+from notation import decode_position, load_positions
+
+
+def scripted_position(seed: int, plies: int) -> GameState:
+    """Partida `seed` tras `plies` jugadas deterministas."""
+    random.seed(seed)
+    state = create_initial_game_state()
+    for _ in range(plies):
+        if state.finished:
+            break
+        _, move = alphabeta(state, 1, maximizing_for=state.current_turn)
+        if move is None:
+            state.pass_turn()
+        else:
+            state.apply_move(move)
+    return state
+
+
+def build_corpus(count: int, seed: int = 42,
+                 max_plies: int = 12) -> List[Tuple[str, GameState]]:
+    """`count` posiciones no terminadas, con distinto número de jugadas previas.
+
+    Cada una va con un nombre "s<semilla>p<jugadas>" que la identifica en los
+    informes (y permite regenerarla con `scripted_position`).
+    """
+    corpus: List[Tuple[str, GameState]] = []
+    i = 0
+    while len(corpus) < count:
+        plies = i % (max_plies + 1)
+        state = scripted_position(seed + i, plies)
+        if not state.finished:
+            corpus.append((f"s{seed + i}p{plies}", state))
+        i += 1
+    return corpus
+
+
+def load_corpus(values: List[str]) -> List[Tuple[str, GameState]]:
+    """Corpus a partir de los `--position` de los benchmarks: cada valor es una
+    posición en notación o la ruta de un archivo con una por línea."""
+    texts: List[str] = []
+    for value in values:
+        texts.extend(load_positions(value) if os.path.isfile(value) else [value])
+    # Las mismas tablas para todas las posiciones
+    cards = load_cards(config.CARDS_FILE)
+    fusions = load_fusions(config.FUSIONS_FILE)
+    combat = CombatTable(cards)
+    return [(f"pos{i + 1}", decode_position(text, cards, fusions, combat))
+            for i, text in enumerate(texts)]
+
+
+def build_positions(count: int, seed: int = 42, max_plies: int = 12) -> List[GameState]:
+    """Las posiciones de `build_corpus`, sin nombre."""
+    return [state for _, state in build_corpus(count, seed, max_plies)]
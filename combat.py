@@ -0,0 +1,42 @@
+"""
+Tabla precalculada de combates carta contra carta.
+
+Un ataque entre monstruos solo depende de los ATK de ambas cartas: gana el
+mayor y el perdedor recibe la diferencia como daño (empate = se destruyen
+ambos, sin daño). `CombatTable` guarda esa diferencia para cada pareja
+atacante×defensor en una matriz de NumPy construida una vez al cargar las
+cartas, así que escala a bases de miles de cartas sin objetos Python por
+pareja.
+
+Para las consultas sueltas de la búsqueda (un ataque por nodo) indexar NumPy
+es más lento que un dict, así que la fila de cada atacante se convierte a un
+dict {defensor: margen} la primera vez que se usa.
+"""
+from typing import TYPE_CHECKING, Dict
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from game_models import Card
+
+class CombatTable:
+    """margin[i, j] = ATK(atacante i) - ATK(defensor j), con i, j índices de `ids`."""
+
+    def __init__(self, cards: Dict[int, "Card"]) -> None:
+        self.ids = np.array(sorted(cards), dtype=np.int64)
+        self.index: Dict[int, int] = {int(cid): i for i, cid in enumerate(self.ids)}
+        attack = np.array([cards[int(cid)].attack for cid in self.ids], dtype=np.int32)
+        self.margin: np.ndarray = attack[:, None] - attack[None, :]
+        self._rows: Dict[int, Dict[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def row(self, attacker_id: int) -> Dict[int, int]:
+        """{id del defensor: margen} del atacante (se materializa al primer uso)."""
+        row = self._rows.get(attacker_id)
+        if row is None:
+            margins = self.margin[self.index[attacker_id]].tolist()
+            row = dict(zip(self.ids.tolist(), margins))
+            self._rows[attacker_id] = row
+        return row
@@ -9,6 +9,14 @@ WINDOW_WIDTH = 1400          # Ancho de la ventana
 WINDOW_HEIGHT = 720          # Alto de la ventana
 FPS = 30                     # Cuadros por segundo
 
+# Perfilado (python main.py --profile o YGO_PROFILE=1; ver profiling.py)
+PROFILE = False              # Perfilar siempre, sin necesidad de la opción
+PROFILE_START_FRAME = 60     # Cuadros que se dejan pasar antes de perfilar (arranque)
+PROFILE_FRAMES = 300         # Cuadros de la ventana perfilada (0 = solo la IA)
+PROFILE_AI = True            # Perfilar por separado cada choose_ai_move
+PROFILE_SAMPLE_MS = 1.0      # Intervalo del muestreo de pilas (.collapsed)
+PROFILE_DIR = "profiles"     # Carpeta de salida (una subcarpeta por sesión)
+
 # ============================================================================
 # 2. CONFIGURACIÓN DEL JUEGO
 # ============================================================================
@@ -25,13 +33,48 @@ MAX_MONSTERS = 5             # Monstruos máximos en campo por jugador
 # ============================================================================
 # 3. CONFIGURACIÓN DE IA (MINIMAX)
 # ============================================================================
+AI_ENGINE = "minimax"        # "minimax" (según AI_SEARCH_MODE) o "mcts"
 MINIMAX_DEPTH = 2            # Profundidad del árbol de búsqueda
+AI_SEARCH_MODE = "alphabeta" # "minimax" (sin poda), "alphabeta" (misma jugada, menos nodos)
+                             # o "parallel" (alfa-beta repartiendo la raíz entre procesos)
+AI_WORKERS = 0               # Procesos del modo "parallel" (0 = todos los núcleos)
+USE_TRANSPOSITION_TABLE = True  # Reutiliza subárboles repetidos (hash de Zobrist, solo alfa-beta)
+TT_MAX_MB = 32               # Memoria máxima aproximada de la tabla de transposición
+AI_MOVE_ORDERING = True      # Ordena jugadas (TT, capturas, fusiones, killer, histórica) para podar más
+AI_TIME_BUDGET_MS = 0        # > 0: profundización iterativa con este tiempo por turno (ignora MINIMAX_DEPTH)
+AI_MAX_DEPTH = 20            # Profundidad máxima de la profundización iterativa
+ENDGAME_SOLVER = True        # Resolver de forma exacta los finales con pocas cartas
+ENDGAME_THRESHOLD = 10       # Máximo de cartas en juego (mazos, manos y campo de ambos) para resolver
+ENDGAME_MAX_NODES = 200_000  # Si el final necesita más nodos, se usa la búsqueda normal
+ENDGAME_MAX_MS = 300         # Ídem si necesita más tiempo (ms por turno)
+ENDGAME_TIME_SHARE = 0.5     # Con AI_TIME_BUDGET_MS, fracción del presupuesto que puede usar el resolvedor
+AI_DEDUP_MOVES = True        # La búsqueda descarta jugadas equivalentes (misma carta desde otra posición)
+AI_CANONICAL_KEYS = True     # Claves de la TT sin orden de mano ni casillas del campo (más aciertos)
+AI_BATCH_EVAL = True         # Evalúa juntas las hojas de cada nodo a profundidad 1
+AI_BATCH_EVAL_NUMPY_MIN = 64 # Hojas a partir de las cuales ese lote se evalúa con NumPy
+AI_EVAL_LP_WEIGHT = 1        # Peso de la diferencia de LP en la evaluación (entero)
+AI_EVAL_ATK_WEIGHT = 1       # Peso de la diferencia de ATK en el campo (entero)
+DEBUG_EVAL_CHECK = False     # Compara la evaluación incremental con el recálculo completo (lento)
+AI_STATS_LOG = "logs/search_stats.jsonl"  # Estadísticas de cada búsqueda de la GUI (None = no guardar)
+
+# Monte Carlo Tree Search (AI_ENGINE = "mcts")
+MCTS_ITERATIONS = 2000       # Simulaciones por jugada
+MCTS_TIME_MS = 0             # > 0: simular durante este tiempo en vez de MCTS_ITERATIONS
+MCTS_EXPLORATION = 1.41      # Constante de exploración de UCT
+MCTS_ROLLOUT_DEPTH = 40      # Jugadas máximas por simulación (luego se usa la evaluación)
+MCTS_EVAL_SCALE = 2000       # Escala para convertir la evaluación en probabilidad de ganar
+MCTS_SEED = None             # Semilla de las simulaciones (None = aleatoria)
+
+# Simulación sin interfaz (python main.py --headless)
+SIM_GAMES = 100              # Partidas IA contra IA por defecto
+SIM_MAX_TURNS = 400          # Cambios de turno tras los que una partida cuenta como empate
 
 # ============================================================================
 # 4. RUTAS DE ARCHIVOS
 # ============================================================================
 CARDS_FILE = "data/cards.json"
 FUSIONS_FILE = "data/fusions.json"
+POSITIONS_FILE = "logs/positions.txt"  # Posiciones capturadas en la GUI con la tecla P (ver notation.py)
 
 # ============================================================================
 # 5. CONSTANTES DE DISEÑO (para UI)
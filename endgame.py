@@ -0,0 +1,193 @@
+"""
+Resolución exacta de finales.
+
+Cuando quedan pocas cartas (mazo + mano de ambos jugadores) el árbol completo
+hasta el final de la partida es pequeño: se busca hasta estados terminales con
+memoización y se obtiene el resultado demostrado (victoria, derrota o tablas)
+en lugar de una estimación de `evaluate_state`.
+
+Modelo de juego igual al de la búsqueda: se juega una de `valid_moves` y solo
+se pasa turno si no hay ninguna. Toda jugada progresa (se gastan cartas, se
+destruyen monstruos o se quitan LP), así que la única situación sin final es
+que ningún jugador tenga cartas: eso son tablas.
+
+El resolvedor se rinde (EndgameTooLarge) al pasar de `max_nodes` nodos o de
+su instante límite, y se cancela como la búsqueda normal con `stop_event`.
+"""
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Set, Tuple
+
+import config
+from game_models import GameState, Move, Z_SEARCH, zobrist_key
+
+WIN, DRAW, LOSS = 1, 0, -1
+OUTCOME_NAMES = {WIN: "win", DRAW: "draw", LOSS: "loss"}
+
+# Tipo de valor memorizado
+_EXACT, _LOWER, _UPPER = 0, 1, 2
+
+
+class EndgameTooLarge(Exception):
+    """El árbol superó el límite de nodos o de tiempo: hay que volver a la
+    búsqueda heurística."""
+
+
+@dataclass
+class EndgameResult:
+    outcome: int            # WIN / DRAW / LOSS para `maximizing_for`
+    move: Optional[Move]    # jugada óptima (None = pasar)
+    nodes: int
+
+    @property
+    def outcome_name(self) -> str:
+        return OUTCOME_NAMES[self.outcome]
+
+
+def remaining_cards(state: GameState) -> int:
+    """Cartas en juego: mazos, manos y monstruos en el campo de ambos jugadores
+    (los del campo también multiplican las jugadas posibles)."""
+    return sum(p.cards_left + len(p.hand) + p.monster_count for p in (state.player, state.ai))
+
+
+def is_endgame(state: GameState, threshold: int) -> bool:
+    return not state.finished and remaining_cards(state) <= threshold
+
+
+def _has_no_cards(state: GameState) -> bool:
+    for p in (state.player, state.ai):
+        if p.cards_left or p.hand or p.monster_count:
+            return False
+    return True
+
+
+class EndgameSolver:
+    """Minimax exacto con valores {-1, 0, 1}, poda alfa-beta y memoización."""
+
+    def __init__(self, maximizing_for: str, max_nodes: int,
+                 deadline: Optional[float] = None,
+                 stop_event: Optional[threading.Event] = None) -> None:
+        self.maximizing_for = maximizing_for
+        self.max_nodes = max_nodes
+        self.deadline = deadline        # instante límite (time.perf_counter)
+        self.stop_event = stop_event    # activado = cancelar
+        self.nodes = 0
+        self.memo: Dict[int, Tuple[int, int]] = {}
+        self._path: Set[int] = set()
+
+    def _terminal_value(self, state: GameState) -> Optional[int]:
+        if state.finished:
+            if state.winner == "draw":
+                return DRAW
+            return WIN if state.winner == self.maximizing_for else LOSS
+        if _has_no_cards(state):
+            return DRAW
+        return None
+
+    def _key(self, state: GameState) -> int:
+        key = state.canonical_hash() if config.AI_CANONICAL_KEYS else state.zobrist_hash()
+        if self.maximizing_for == "player":
+            key ^= zobrist_key(0, Z_SEARCH, 0, 0)
+        return key
+
+    def _check(self) -> None:
+        """Cada cierto número de nodos revisa la cancelación y el reloj
+        (como SearchContext.visit)."""
+        if self.stop_event is not None and self.stop_event.is_set():
+            from ai_minimax import SearchCancelled
+            raise SearchCancelled()
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            raise EndgameTooLarge()
+
+    def value(self, state: GameState, alpha: int = LOSS, beta: int = WIN) -> int:
+        self.nodes += 1
+        if self.nodes > self.max_nodes:
+            raise EndgameTooLarge()
+        if (self.nodes & 127) == 0:
+            self._check()
+        terminal = self._terminal_value(state)
+        if terminal is not None:
+            return terminal
+
+        key = self._key(state)
+        entry = self.memo.get(key)
+        if entry is not None:
+            value, flag = entry
+            if flag == _EXACT:
+                return value
+            if flag == _LOWER:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if alpha >= beta:
+                return value
+        if key in self._path:
+            return DRAW  # repetición: nadie puede forzar progreso
+        alpha_orig, beta_orig = alpha, beta
+
+        # Generación por etapas (ataques primero): tras una poda no se genera el resto
+        moves = state.distinct(state.iter_moves()) if state.has_moves() else (None,)
+        maximizing = state.current_turn == self.maximizing_for
+        best = LOSS if maximizing else WIN
+        self._path.add(key)
+        try:
+            for m in moves:
+                record = state.make_move(m)
+                v = self.value(state, alpha, beta)
+                state.undo_move(record)
+                if maximizing:
+                    best = max(best, v)
+                    alpha = max(alpha, best)
+                else:
+                    best = min(best, v)
+                    beta = min(beta, best)
+                if alpha >= beta:
+                    break
+        finally:
+            self._path.discard(key)
+
+        if best <= alpha_orig:
+            flag = _UPPER
+        elif best >= beta_orig:
+            flag = _LOWER
+        else:
+            flag = _EXACT
+        self.memo[key] = (best, flag)
+        return best
+
+
+def solve_endgame(state: GameState, maximizing_for: str = "ai",
+                  max_nodes: int = 200_000, deadline: Optional[float] = None,
+                  stop_event: Optional[threading.Event] = None) -> EndgameResult:
+    """Resultado demostrado y jugada óptima desde `state`.
+
+    Entre jugadas con el mismo resultado se elige la de mejor evaluación
+    inmediata (gana más rápido / pierde más tarde en la práctica).
+    Lanza EndgameTooLarge si se superan `max_nodes` nodos o `deadline`
+    (time.perf_counter), y SearchCancelled si se activa `stop_event`.
+    """
+    from ai_minimax import evaluate_state
+
+    solver = EndgameSolver(maximizing_for, max_nodes, deadline, stop_event)
+    root = state.clone()
+    terminal = solver._terminal_value(root)
+    if terminal is not None:
+        return EndgameResult(terminal, None, 1)
+
+    sign = 1 if maximizing_for == "ai" else -1
+    maximizing = root.current_turn == maximizing_for
+    best_key = None
+    best_move: Optional[int] = None
+    # Sin las jugadas equivalentes: se conserva la primera, así que la elegida no cambia
+    for m in list(root.distinct(root.valid_moves_packed())) or [None]:
+        record = root.make_move(m)
+        outcome = solver.value(root)
+        heuristic = sign * evaluate_state(root)
+        root.undo_move(record)
+        key = (outcome, heuristic) if maximizing else (-outcome, -heuristic)
+        if best_key is None or key > best_key:
+            best_key, best_move = key, m
+    outcome = best_key[0] if maximizing else -best_key[0]
+    return EndgameResult(outcome, None if best_move is None else Move.from_packed(best_move),
+                         solver.nodes)
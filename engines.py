@@ -0,0 +1,81 @@
+"""
+Selección del motor de IA según `config.AI_ENGINE`.
+
+Todos los motores exponen `choose_ai_move(state, stop_event=None, side="ai",
+stats=None)`.
+"""
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Optional, Tuple
+
+import ai_mcts
+import ai_minimax
+import config
+from ai_minimax import SearchStats
+from profiling import profile_ai_call
+from game_models import GameState, Move
+
+ChooseMove = Callable[..., Optional[Move]]
+
+ENGINES: Dict[str, ChooseMove] = {
+    "minimax": ai_minimax.choose_ai_move,
+    "mcts": ai_mcts.choose_ai_move,
+}
+
+
+def get_engine(name: Optional[str] = None) -> ChooseMove:
+    """Función `choose_ai_move` del motor `name` (por defecto config.AI_ENGINE)."""
+    name = name or config.AI_ENGINE
+    try:
+        return ENGINES[name]
+    except KeyError:
+        raise ValueError(f"AI_ENGINE desconocido: {name!r}") from None
+
+
+def choose_ai_move(state: GameState,
+                   stop_event: Optional[threading.Event] = None,
+                   side: str = "ai",
+                   stats: Optional[SearchStats] = None) -> Optional[Move]:
+    """Jugada de `side` con el motor configurado."""
+    return get_engine()(state, stop_event=stop_event, side=side, stats=stats)
+
+
+def choose_ai_move_with_stats(state: GameState,
+                              stop_event: Optional[threading.Event] = None,
+                              side: str = "ai",
+                              stats: Optional[SearchStats] = None
+                              ) -> Tuple[Optional[Move], SearchStats]:
+    """Como `choose_ai_move`, devolviendo también los contadores de la búsqueda.
+
+    `stats` se va llenando durante la búsqueda (la GUI lo lee mientras la IA
+    piensa). Si `config.AI_STATS_LOG` tiene una ruta, se añade allí una línea
+    JSON por búsqueda. Con una sesión de perfilado abierta, cada llamada se
+    perfila por separado.
+    """
+    if stats is None:
+        stats = SearchStats()
+    with profile_ai_call():
+        move = choose_ai_move(state, stop_event=stop_event, side=side, stats=stats)
+    if config.AI_STATS_LOG:
+        log_search_stats(config.AI_STATS_LOG, state, side, move, stats)
+    return move, stats
+
+
+def log_search_stats(path: str, state: GameState, side: str,
+                     move: Optional[Move], stats: SearchStats) -> None:
+    """Añade una búsqueda al registro JSONL `path` (una línea por búsqueda)."""
+    record = {
+        "time": datetime.now().isoformat(timespec="milliseconds"),
+        "engine": config.AI_ENGINE,
+        "side": side,
+        "turn": state.turn_count,
+        "move": None if move is None else {"kind": move.kind, **move.params},
+        **stats.to_dict(),
+    }
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
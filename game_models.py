@@ -1,12 +1,54 @@
 import json
 import random
 from dataclasses import dataclass, field
-from typing import List, Optional, Tuple, Dict
+from typing import Iterable, Iterator, List, Optional, Tuple, Dict, Union
 
 import config
+from combat import CombatTable
 
 
-@dataclass
+# ====================================================
+# Hash de Zobrist
+# ====================================================
+# Cada componente del estado (carta en una posición de la mano, del campo o
+# del mazo, LP de cada jugador, turno) tiene una clave de 64 bits; el hash de
+# un estado es el XOR de las claves de sus componentes, así que una jugada
+# solo tiene que "quitar" y "poner" las claves de lo que cambia.
+#
+# La clave canónica (GameState.canonical_hash) usa las mismas claves pero las
+# suma módulo 2^64 y toma las cartas de la mano y del campo sin su posición:
+# así no distingue el orden de la mano ni qué casilla ocupa cada monstruo
+# (posiciones equivalentes para las reglas) y, al ser una suma, una carta
+# repetida no se anula consigo misma como pasaría con XOR.
+
+Z_HAND, Z_ZONE, Z_DECK, Z_LP, Z_TURN, Z_SEARCH = range(6)
+
+_MASK64 = (1 << 64) - 1
+_ZOBRIST_CACHE: Dict[Tuple[int, int, int, int], int] = {}
+
+
+def _splitmix64(x: int) -> int:
+    x = (x + 0x9E3779B97F4A7C15) & _MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return x ^ (x >> 31)
+
+
+def zobrist_key(side: int, part: int, index: int, value: int) -> int:
+    """Clave pseudoaleatoria (determinista) para un componente del estado.
+
+    side: 0 = jugador, 1 = IA. part: Z_HAND, Z_ZONE, Z_DECK, Z_LP, ...
+    """
+    k = (side, part, index, value)
+    key = _ZOBRIST_CACHE.get(k)
+    if key is None:
+        packed = ((((side << 4) | part) << 16 | (index & 0xFFFF)) << 32) | (value & 0xFFFFFFFF)
+        key = _splitmix64(packed)
+        _ZOBRIST_CACHE[k] = key
+    return key
+
+
+@dataclass(slots=True)
 class Card:
     id: int
     name: str
@@ -20,34 +62,197 @@ class Card:
         return f"{self.name} (ATK {self.attack}, DEF {self.defense})"
 
 
-@dataclass
+@dataclass(slots=True)
 class FusionRule:
     ingredients: Tuple[int, int]
     result: int
 
 
-@dataclass
+class FusionIndex(dict):
+    """Tabla de fusiones {(id menor, id mayor): resultado} con índice por carta.
+
+    Sigue siendo un dict (``key in fusions``, ``fusions[key]``), y además
+    `partners[c]` da {compañero: resultado} de cada carta, de modo que las
+    fusiones de una mano salen de mirar los compañeros de cada carta en lugar
+    de ordenar y buscar todas las parejas.
+
+    Todos los métodos que cambian el dict pasan por `__setitem__` o
+    `__delitem__`, que ordenan la pareja y mantienen `partners` al día.
+    """
+
+    def __init__(self, rules=()) -> None:
+        super().__init__()
+        self.partners: Dict[int, Dict[int, int]] = {}
+        self.update(rules)
+
+    def __reduce__(self):
+        # pickle (procesos de ai_parallel) rehace el índice a partir de las reglas
+        return FusionIndex, (dict(self),)
+
+    @staticmethod
+    def _key(key: Tuple[int, int]) -> Tuple[int, int]:
+        c1, c2 = key
+        return (c1, c2) if c1 <= c2 else (c2, c1)
+
+    def __setitem__(self, key: Tuple[int, int], result: int) -> None:
+        c1, c2 = self._key(key)
+        super().__setitem__((c1, c2), result)
+        self.partners.setdefault(c1, {})[c2] = result
+        self.partners.setdefault(c2, {})[c1] = result
+
+    def __delitem__(self, key: Tuple[int, int]) -> None:
+        c1, c2 = self._key(key)
+        super().__delitem__((c1, c2))
+        for a, b in {(c1, c2), (c2, c1)}:
+            partners = self.partners[a]
+            del partners[b]
+            if not partners:
+                del self.partners[a]
+
+    def update(self, rules=(), **kwargs) -> None:
+        if kwargs:
+            raise TypeError("FusionIndex: las claves son parejas de ids, no nombres")
+        for key, result in (rules.items() if isinstance(rules, dict) else rules):
+            self[key] = result
+
+    def setdefault(self, key: Tuple[int, int], default: int = None) -> int:
+        key = self._key(key)
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, key: Tuple[int, int], *default: int) -> int:
+        key = self._key(key)
+        if key not in self:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        result = self[key]
+        del self[key]
+        return result
+
+    def popitem(self) -> Tuple[Tuple[int, int], int]:
+        if not self:
+            raise KeyError("popitem(): FusionIndex vacío")
+        key = next(reversed(self))
+        return key, self.pop(key)
+
+    def clear(self) -> None:
+        super().clear()
+        self.partners.clear()
+
+    def copy(self) -> "FusionIndex":
+        return FusionIndex(self)
+
+    def __ior__(self, rules) -> "FusionIndex":
+        self.update(rules)
+        return self
+
+    def __or__(self, rules) -> "FusionIndex":
+        merged = self.copy()
+        merged.update(rules)
+        return merged
+
+    def result(self, c1: int, c2: int) -> Optional[int]:
+        """Carta resultante de fusionar c1 y c2 (None si no se fusionan)."""
+        p = self.partners.get(c1)
+        return p.get(c2) if p is not None else None
+
+    def hand_pairs(self, hand: List[int]) -> List[Tuple[int, int, int]]:
+        """(i, j, resultado) de cada pareja fusionable de la mano, con i < j y
+        en el mismo orden que recorrer todas las parejas."""
+        pairs = []
+        partners = self.partners
+        n = len(hand)
+        for i in range(n - 1):
+            p = partners.get(hand[i])
+            if p is None:
+                continue
+            for j in range(i + 1, n):
+                result = p.get(hand[j])
+                if result is not None:
+                    pairs.append((i, j, result))
+        return pairs
+
+    def partners_in_hand(self, hand: List[int], index: int) -> List[Tuple[int, int]]:
+        """(j, resultado) de las cartas de la mano que se fusionan con hand[index]."""
+        p = self.partners.get(hand[index])
+        if p is None:
+            return []
+        return [(j, p[cid]) for j, cid in enumerate(hand) if j != index and cid in p]
+
+
+@dataclass(slots=True)
 class PlayerState:
     name: str
     life_points: int = config.STARTING_LP
-    deck: List[int] = field(default_factory=list)   # ids de cartas
+    # Mazo completo (inmutable, compartido entre copias) y cuántas cartas se han robado.
+    # Solo se roba por arriba, así que el mazo restante es deck_cards[deck_pos:].
+    deck_cards: Tuple[int, ...] = ()   # ids de cartas
+    deck_pos: int = 0
     hand: List[int] = field(default_factory=list)
     # ANTES se llamaba 'field', eso causaba el conflicto con dataclasses.field
     monster_zone: List[Optional[int]] = field(default_factory=lambda: [None] * config.MAX_MONSTERS)
     graveyard: List[int] = field(default_factory=list)
+    # Totales del campo, mantenidos por GameState al cambiar monster_zone
+    # (ver GameState.refresh_field_stats)
+    field_attack: int = 0
+    field_defense: int = 0
+    monster_count: int = 0
 
-    def clone(self) -> "PlayerState":
-        return PlayerState(
-            name=self.name,
-            life_points=self.life_points,
-            deck=list(self.deck),
-            hand=list(self.hand),
-            monster_zone=list(self.monster_zone),
-            graveyard=list(self.graveyard),
-        )
+    @property
+    def deck(self) -> Tuple[int, ...]:
+        """Cartas que quedan en el mazo, en orden de robo."""
+        return self.deck_cards[self.deck_pos:]
 
+    @property
+    def cards_left(self) -> int:
+        return len(self.deck_cards) - self.deck_pos
 
-@dataclass
+    def clone(self) -> "PlayerState":
+        # Sin pasar por __init__: es la operación más frecuente de la IA
+        new = PlayerState.__new__(PlayerState)
+        new.name = self.name
+        new.life_points = self.life_points
+        new.deck_cards = self.deck_cards      # inmutable: se comparte
+        new.deck_pos = self.deck_pos
+        new.hand = self.hand[:]
+        new.monster_zone = self.monster_zone[:]
+        new.graveyard = self.graveyard[:]
+        new.field_attack = self.field_attack
+        new.field_defense = self.field_defense
+        new.monster_count = self.monster_count
+        return new
+
+    def zobrist(self, side: int) -> int:
+        """Hash completo de este jugador (el cementerio no afecta al juego)."""
+        h = zobrist_key(side, Z_LP, 0, self.life_points)
+        for i, cid in enumerate(self.hand):
+            h ^= zobrist_key(side, Z_HAND, i, cid)
+        for i, cid in enumerate(self.monster_zone):
+            if cid is not None:
+                h ^= zobrist_key(side, Z_ZONE, i, cid)
+        # Posición contada desde el fondo: robar la primera carta no mueve al resto
+        n = len(self.deck_cards)
+        for i in range(self.deck_pos, n):
+            h ^= zobrist_key(side, Z_DECK, n - 1 - i, self.deck_cards[i])
+        return h
+
+    def canonical(self, side: int) -> int:
+        """Parte de este jugador en la clave canónica (mano y campo como multiconjuntos)."""
+        h = zobrist_key(side, Z_LP, 0, self.life_points)
+        for cid in self.hand:
+            h += zobrist_key(side, Z_HAND, 0, cid)
+        for cid in self.monster_zone:
+            if cid is not None:
+                h += zobrist_key(side, Z_ZONE, 0, cid)
+        n = len(self.deck_cards)
+        for i in range(self.deck_pos, n):
+            h += zobrist_key(side, Z_DECK, n - 1 - i, self.deck_cards[i])
+        return h & _MASK64
+
+
+@dataclass(slots=True)
 class Move:
     # Tipos de jugada muy simplificados:
     # - "summon": invocar un monstruo desde la mano
@@ -56,27 +261,229 @@ class Move:
     kind: str
     params: dict
 
+    def to_packed(self) -> int:
+        """Codificación entera de la jugada (ver pack_summon/pack_fusion/pack_attack)."""
+        p = self.params
+        if self.kind == "summon":
+            return pack_summon(p["hand_index"], p["slot_index"])
+        if self.kind == "fusion":
+            return pack_fusion(p["hand_index_1"], p["hand_index_2"], p["slot_index"])
+        if self.kind == "attack":
+            return pack_attack(p["attacker_slot"], p.get("defender_slot"))
+        raise ValueError(f"Tipo de jugada desconocido: {self.kind!r}")
+
+    @staticmethod
+    def from_packed(pm: int) -> "Move":
+        kind = pm & 3
+        f1, f2, f3 = (pm >> 2) & 63, (pm >> 8) & 63, (pm >> 14) & 63
+        if kind == PM_SUMMON:
+            return Move(kind="summon", params={"hand_index": f1, "slot_index": f3})
+        if kind == PM_FUSION:
+            return Move(kind="fusion", params={"hand_index_1": f1, "hand_index_2": f2, "slot_index": f3})
+        return Move(kind="attack", params={"attacker_slot": f1,
+                                           "defender_slot": None if f2 == PM_DIRECT else f2})
 
-@dataclass
+
+# ====================================================
+# Jugadas empaquetadas en un entero
+# ====================================================
+# La búsqueda trabaja con enteros en lugar de Move (sin dict ni comparación de
+# cadenas por nodo). Bits 0-1: tipo; 2-7, 8-13 y 14-19: tres índices de 6 bits.
+#   summon: (hand_index, -, slot_index)
+#   fusion: (hand_index_1, hand_index_2, slot_index)
+#   attack: (attacker_slot, defender_slot o PM_DIRECT, -)
+
+PM_SUMMON, PM_FUSION, PM_ATTACK = 0, 1, 2
+PM_DIRECT = 63  # defender_slot de un ataque directo
+CM_NONE = 0xFFFF  # defensor de un ataque directo en GameState.card_move
+
+
+def pack_summon(hand_index: int, slot_index: int) -> int:
+    return PM_SUMMON | (hand_index << 2) | (slot_index << 14)
+
+
+def pack_fusion(hand_index_1: int, hand_index_2: int, slot_index: int) -> int:
+    return PM_FUSION | (hand_index_1 << 2) | (hand_index_2 << 8) | (slot_index << 14)
+
+
+def pack_attack(attacker_slot: int, defender_slot: Optional[int]) -> int:
+    d = PM_DIRECT if defender_slot is None else defender_slot
+    return PM_ATTACK | (attacker_slot << 2) | (d << 8)
+
+
+# Operaciones del diario de deshacer (ver GameState.make_move)
+U_HAND_POP, U_ZONE_SET, U_GRAVEYARD, U_DRAW = range(4)
+
+
+@dataclass(slots=True)
+class UndoRecord:
+    """Lo necesario para deshacer una jugada hecha con GameState.make_move."""
+    current_turn: str
+    turn_count: int
+    finished: bool
+    winner: Optional[str]
+    zhash: Optional[int]
+    chash: Optional[int]
+    player_lp: int
+    ai_lp: int
+    # Cambios en listas, en orden de aplicación: (operación, jugador, índice, valor)
+    journal: List[Tuple[int, PlayerState, int, Optional[int]]] = field(default_factory=list)
+
+
+@dataclass(slots=True)
 class GameState:
     cards: Dict[int, Card]
-    fusions: Dict[Tuple[int, int], int]
+    fusions: FusionIndex
     player: PlayerState
     ai: PlayerState
     current_turn: str = "player"  # "player" o "ai"
     finished: bool = False
     winner: Optional[str] = None  # "player", "ai", "draw" o None
+    turn_count: int = 0           # cambios de turno desde el inicio de la partida
+    # Resultados de combate precalculados (se construye desde `cards` si no se pasa)
+    combat: Optional[CombatTable] = field(default=None, repr=False, compare=False)
+    # Hash de Zobrist mantenido de forma incremental (None = aún no calculado)
+    _zhash: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+    # Clave canónica, igual que _zhash (ver canonical_hash)
+    _chash: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+    # Diario de la jugada en curso de make_move (None = no se registra)
+    _journal: Optional[list] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.fusions, FusionIndex):
+            self.fusions = FusionIndex(self.fusions)
+        if self.combat is None:
+            self.combat = CombatTable(self.cards)
+        self.refresh_field_stats()
 
     def clone(self) -> "GameState":
-        return GameState(
-            cards=self.cards,
-            fusions=self.fusions,
-            player=self.player.clone(),
-            ai=self.ai.clone(),
-            current_turn=self.current_turn,
-            finished=self.finished,
-            winner=self.winner,
-        )
+        # Sin pasar por __init__/__post_init__: los totales del campo ya están al día
+        new = GameState.__new__(GameState)
+        new.cards = self.cards
+        new.fusions = self.fusions
+        new.combat = self.combat
+        new.player = self.player.clone()
+        new.ai = self.ai.clone()
+        new.current_turn = self.current_turn
+        new.finished = self.finished
+        new.winner = self.winner
+        new.turn_count = self.turn_count
+        new._zhash = self._zhash
+        new._chash = self._chash
+        new._journal = None
+        return new
+
+    # ---------------------------
+    # Totales del campo
+    # ---------------------------
+
+    def refresh_field_stats(self) -> None:
+        """Recalcula desde cero field_attack/field_defense/monster_count de ambos jugadores."""
+        for p in (self.player, self.ai):
+            monsters = [self.cards[cid] for cid in p.monster_zone if cid is not None]
+            p.field_attack = sum(c.attack for c in monsters)
+            p.field_defense = sum(c.defense for c in monsters)
+            p.monster_count = len(monsters)
+
+    def _write_slot(self, player: PlayerState, slot: int, card_id: Optional[int]) -> None:
+        """Escribe una casilla del campo actualizando los totales del jugador."""
+        old = player.monster_zone[slot]
+        if old is not None:
+            card = self.cards[old]
+            player.field_attack -= card.attack
+            player.field_defense -= card.defense
+            player.monster_count -= 1
+        if card_id is not None:
+            card = self.cards[card_id]
+            player.field_attack += card.attack
+            player.field_defense += card.defense
+            player.monster_count += 1
+        player.monster_zone[slot] = card_id
+
+    # ---------------------------
+    # Hash de Zobrist
+    # ---------------------------
+
+    def zobrist_hash(self) -> int:
+        """Hash del estado; a partir de la primera llamada se actualiza por jugada."""
+        if self._zhash is None:
+            h = self.player.zobrist(0) ^ self.ai.zobrist(1)
+            if self.current_turn == "ai":
+                h ^= zobrist_key(0, Z_TURN, 0, 0)
+            self._zhash = h
+        return self._zhash
+
+    def canonical_hash(self) -> int:
+        """Clave que no distingue el orden de la mano ni las casillas del campo.
+
+        Dos estados con la misma clave tienen las mismas jugadas (salvo los
+        índices) y el mismo valor en la búsqueda. Se actualiza por jugada
+        igual que zobrist_hash.
+        """
+        if self._chash is None:
+            h = self.player.canonical(0) + self.ai.canonical(1)
+            if self.current_turn == "ai":
+                h += zobrist_key(0, Z_TURN, 0, 0)
+            self._chash = h & _MASK64
+        return self._chash
+
+    def _side(self, player: PlayerState) -> int:
+        return 0 if player is self.player else 1
+
+    def _hand_pop(self, player: PlayerState, index: int) -> int:
+        hand = player.hand
+        h = self._zhash
+        if h is None:
+            card_id = hand.pop(index)
+        else:
+            side = self._side(player)
+            # Las cartas a la derecha de `index` cambian de posición
+            for i in range(index, len(hand)):
+                h ^= zobrist_key(side, Z_HAND, i, hand[i])
+            card_id = hand.pop(index)
+            for i in range(index, len(hand)):
+                h ^= zobrist_key(side, Z_HAND, i, hand[i])
+            self._zhash = h
+        if self._chash is not None:
+            self._chash = (self._chash - zobrist_key(self._side(player), Z_HAND, 0, card_id)) & _MASK64
+        if self._journal is not None:
+            self._journal.append((U_HAND_POP, player, index, card_id))
+        return card_id
+
+    def _zone_set(self, player: PlayerState, slot: int, card_id: Optional[int]) -> None:
+        old = player.monster_zone[slot]
+        if self._zhash is not None:
+            side = self._side(player)
+            if old is not None:
+                self._zhash ^= zobrist_key(side, Z_ZONE, slot, old)
+            if card_id is not None:
+                self._zhash ^= zobrist_key(side, Z_ZONE, slot, card_id)
+        if self._chash is not None:
+            side = self._side(player)
+            h = self._chash
+            if old is not None:
+                h -= zobrist_key(side, Z_ZONE, 0, old)
+            if card_id is not None:
+                h += zobrist_key(side, Z_ZONE, 0, card_id)
+            self._chash = h & _MASK64
+        if self._journal is not None:
+            self._journal.append((U_ZONE_SET, player, slot, old))
+        self._write_slot(player, slot, card_id)
+
+    def _to_graveyard(self, player: PlayerState, card_id: int) -> None:
+        player.graveyard.append(card_id)
+        if self._journal is not None:
+            self._journal.append((U_GRAVEYARD, player, 0, None))
+
+    def _set_life_points(self, player: PlayerState, value: int) -> None:
+        if self._zhash is not None:
+            side = self._side(player)
+            self._zhash ^= zobrist_key(side, Z_LP, 0, player.life_points) ^ zobrist_key(side, Z_LP, 0, value)
+        if self._chash is not None:
+            side = self._side(player)
+            self._chash = (self._chash - zobrist_key(side, Z_LP, 0, player.life_points)
+                           + zobrist_key(side, Z_LP, 0, value)) & _MASK64
+        player.life_points = value
 
     # ---------------------------
     # Utilidades
@@ -90,6 +497,12 @@ class GameState:
 
     def switch_turn(self) -> None:
         self.current_turn = "ai" if self.current_turn == "player" else "player"
+        self.turn_count += 1
+        if self._zhash is not None:
+            self._zhash ^= zobrist_key(0, Z_TURN, 0, 0)
+        if self._chash is not None:
+            k = zobrist_key(0, Z_TURN, 0, 0)
+            self._chash = (self._chash + (k if self.current_turn == "ai" else -k)) & _MASK64
 
     # ---------------------------
     # Reglas básicas
@@ -98,9 +511,27 @@ class GameState:
     def draw_card(self, player: Optional[PlayerState] = None) -> None:
         if player is None:
             player = self.get_active_player()
-        if player.deck:
-            card_id = player.deck.pop(0)
+        n = len(player.deck_cards)
+        if player.deck_pos < n:
+            card_id = player.deck_cards[player.deck_pos]
+            if self._zhash is not None:
+                side = self._side(player)
+                self._zhash ^= zobrist_key(side, Z_DECK, n - 1 - player.deck_pos, card_id)
+                self._zhash ^= zobrist_key(side, Z_HAND, len(player.hand), card_id)
+            if self._chash is not None:
+                side = self._side(player)
+                self._chash = (self._chash - zobrist_key(side, Z_DECK, n - 1 - player.deck_pos, card_id)
+                               + zobrist_key(side, Z_HAND, 0, card_id)) & _MASK64
+            player.deck_pos += 1
             player.hand.append(card_id)
+            if self._journal is not None:
+                self._journal.append((U_DRAW, player, 0, None))
+
+    def pass_turn(self) -> None:
+        """Termina el turno sin jugar: cambia el turno y roba el nuevo jugador activo."""
+        self.switch_turn()
+        self.draw_card(self.get_active_player())
+        self.check_game_over()
 
     def initial_draw(self) -> None:
         # Roba la mano inicial
@@ -125,10 +556,14 @@ class GameState:
 
     def valid_moves(self) -> List[Move]:
         """Genera jugadas simples: invocar un monstruo, o atacar con uno que ya esté en campo."""
+        return [Move.from_packed(pm) for pm in self.valid_moves_packed()]
+
+    def valid_moves_packed(self) -> List[int]:
+        """Las mismas jugadas y en el mismo orden que valid_moves, empaquetadas."""
         if self.finished:
             return []
 
-        moves: List[Move] = []
+        moves: List[int] = []
         current = self.get_active_player()
         opponent = self.get_opponent()
 
@@ -136,20 +571,12 @@ class GameState:
         free_slots = [i for i, c in enumerate(current.monster_zone) if c is None]
         if free_slots:
             for idx, card_id in enumerate(current.hand):
-                moves.append(Move(kind="summon", params={"hand_index": idx, "slot_index": free_slots[0]}))
+                moves.append(pack_summon(idx, free_slots[0]))
 
         # Intentar fusiones (dos cartas de la mano)
-        if len(current.hand) >= 2:
-            for i in range(len(current.hand)):
-                for j in range(i + 1, len(current.hand)):
-                    c1, c2 = current.hand[i], current.hand[j]
-                    key = tuple(sorted((c1, c2)))
-                    if key in self.fusions and free_slots:
-                        moves.append(Move(kind="fusion", params={
-                            "hand_index_1": i,
-                            "hand_index_2": j,
-                            "slot_index": free_slots[0]
-                        }))
+        if free_slots and len(current.hand) >= 2:
+            for i, j, _ in self.fusions.hand_pairs(current.hand):
+                moves.append(pack_fusion(i, j, free_slots[0]))
 
         # Atacar con cualquier monstruo que esté en campo
         attacker_slots = [i for i, cid in enumerate(current.monster_zone) if cid is not None]
@@ -158,35 +585,193 @@ class GameState:
         for a in attacker_slots:
             if opponent_slots:
                 for d in opponent_slots:
-                    moves.append(Move(kind="attack", params={"attacker_slot": a, "defender_slot": d}))
+                    moves.append(pack_attack(a, d))
             else:
                 # Ataque directo
-                moves.append(Move(kind="attack", params={"attacker_slot": a, "defender_slot": None}))
+                moves.append(pack_attack(a, None))
 
         return moves
 
+    def has_moves(self) -> bool:
+        """True si valid_moves no está vacía, sin generar las jugadas."""
+        if self.finished:
+            return False
+        current = self.get_active_player()
+        if current.monster_count:
+            return True  # al menos un ataque
+        # Invocar (y fusionar) necesita carta en mano y casilla libre
+        return bool(current.hand) and None in current.monster_zone
+
+    def iter_moves(self) -> Iterator[int]:
+        """Las jugadas de valid_moves_packed, generadas a medida que se piden.
+
+        Orden por etapas, de las que más cambian la posición a las que menos:
+        ataques, fusiones, invocaciones. Una búsqueda que poda tras las
+        primeras no llega a generar el resto. El estado puede modificarse
+        entre dos jugadas siempre que se restaure (make_move/undo_move).
+        """
+        if self.finished:
+            return
+        current = self.get_active_player()
+        opponent = self.get_opponent()
+
+        # 1. Ataques
+        if current.monster_count:
+            opponent_slots = [i for i, cid in enumerate(opponent.monster_zone) if cid is not None]
+            for a, cid in enumerate(current.monster_zone):
+                if cid is None:
+                    continue
+                if opponent_slots:
+                    for d in opponent_slots:
+                        yield pack_attack(a, d)
+                else:
+                    yield pack_attack(a, None)
+
+        if not current.hand or None not in current.monster_zone:
+            return
+        slot = current.monster_zone.index(None)
+
+        # 2. Fusiones
+        if len(current.hand) >= 2:
+            for i, j, _ in self.fusions.hand_pairs(current.hand):
+                yield pack_fusion(i, j, slot)
+
+        # 3. Invocaciones
+        for idx in range(len(current.hand)):
+            yield pack_summon(idx, slot)
+
+    def distinct(self, moves: Iterable[int]) -> Iterator[int]:
+        """Filtra `moves` dejando la primera de cada grupo de jugadas equivalentes.
+
+        Dos jugadas son equivalentes si llevan a estados que solo difieren en
+        el orden de la mano o en qué casilla ocupa cada monstruo (las reglas y
+        la evaluación no dependen de eso): invocar la misma carta desde dos
+        posiciones de la mano, fusionar la misma pareja de cartas o atacar con
+        la misma carta a la misma carta. Como se conserva la primera, la
+        búsqueda elige la misma jugada que sin filtrar. Admite un generador
+        (iter_moves) si el estado se restaura entre jugadas.
+        """
+        current = self.get_active_player()
+        hand, zone = current.hand, current.monster_zone
+        opponent_zone = self.get_opponent().monster_zone
+        seen = set()
+        for pm in moves:
+            kind = pm & 3
+            if kind == PM_SUMMON:
+                key = hand[(pm >> 2) & 63]
+            elif kind == PM_FUSION:
+                c1, c2 = hand[(pm >> 2) & 63], hand[(pm >> 8) & 63]
+                key = (c1, c2) if c1 <= c2 else (c2, c1)
+            else:
+                d_slot = (pm >> 8) & 63
+                key = (zone[(pm >> 2) & 63], None if d_slot == PM_DIRECT else opponent_zone[d_slot], 0)
+            if key not in seen:
+                seen.add(key)
+                yield pm
+
+    def is_valid_packed(self, pm: int) -> bool:
+        """True si `pm` está entre las jugadas de valid_moves_packed."""
+        if self.finished:
+            return False
+        current = self.get_active_player()
+        kind = pm & 3
+        f1, f2, f3 = (pm >> 2) & 63, (pm >> 8) & 63, (pm >> 14) & 63
+        zone = current.monster_zone
+        if kind == PM_ATTACK:
+            if f1 >= len(zone) or zone[f1] is None or f3:
+                return False
+            opponent = self.get_opponent()
+            if opponent.monster_count:
+                return f2 < len(opponent.monster_zone) and opponent.monster_zone[f2] is not None
+            return f2 == PM_DIRECT
+        if None not in zone or f3 != zone.index(None):
+            return False
+        hand = current.hand
+        if kind == PM_SUMMON:
+            return f1 < len(hand) and f2 == 0
+        if kind == PM_FUSION:
+            return f1 < f2 < len(hand) and self.fusions.result(hand[f1], hand[f2]) is not None
+        return False
+
+    def card_move(self, pm: int) -> int:
+        """La jugada `pm` expresada con ids de carta en lugar de posiciones.
+
+        Sirve para guardar jugadas en cachés con clave canónica: en un estado
+        equivalente la misma jugada puede tener otros índices (ver
+        from_card_move). Bits 0-1: tipo; 2-17 y 18-33: ids de carta
+        (CM_NONE = sin defensor, ataque directo).
+        """
+        current = self.get_active_player()
+        kind = pm & 3
+        if kind == PM_ATTACK:
+            d_slot = (pm >> 8) & 63
+            defender = CM_NONE if d_slot == PM_DIRECT else self.get_opponent().monster_zone[d_slot]
+            return kind | (current.monster_zone[(pm >> 2) & 63] << 2) | (defender << 18)
+        if kind == PM_FUSION:
+            return kind | (current.hand[(pm >> 2) & 63] << 2) | (current.hand[(pm >> 8) & 63] << 18)
+        return kind | (current.hand[(pm >> 2) & 63] << 2)
+
+    def from_card_move(self, cm: int) -> Optional[int]:
+        """Primera jugada válida de este estado que equivale a `cm` (de card_move),
+        o None si no hay ninguna."""
+        if self.finished:
+            return None
+        current = self.get_active_player()
+        hand, zone = current.hand, current.monster_zone
+        kind = cm & 3
+        c1, c2 = (cm >> 2) & 0xFFFF, (cm >> 18) & 0xFFFF
+        if kind == PM_ATTACK:
+            if c1 not in zone:
+                return None
+            opponent_zone = self.get_opponent().monster_zone
+            if c2 == CM_NONE:
+                if self.get_opponent().monster_count:
+                    return None
+                return pack_attack(zone.index(c1), None)
+            if c2 not in opponent_zone:
+                return None
+            return pack_attack(zone.index(c1), opponent_zone.index(c2))
+        if None not in zone or c1 not in hand:
+            return None
+        slot = zone.index(None)
+        if kind == PM_SUMMON:
+            return pack_summon(hand.index(c1), slot)
+        if kind == PM_FUSION:
+            # La primera pareja de la mano con esas dos cartas
+            pair = (c1, c2) if c1 <= c2 else (c2, c1)
+            for i, j, _ in self.fusions.hand_pairs(hand):
+                a, b = hand[i], hand[j]
+                if ((a, b) if a <= b else (b, a)) == pair:
+                    return pack_fusion(i, j, slot)
+        return None
+
     # ---------------------------
     # Aplicar jugadas
     # ---------------------------
 
     def apply_move(self, move: Move) -> None:
+        self.apply_packed(move.to_packed())
+
+    def apply_packed(self, pm: int) -> None:
+        """Aplica una jugada empaquetada (ver pack_summon/pack_fusion/pack_attack)."""
         if self.finished:
             return
 
         current = self.get_active_player()
         opponent = self.get_opponent()
+        kind = pm & 3
 
-        if move.kind == "summon":
-            h_idx = move.params["hand_index"]
-            s_idx = move.params["slot_index"]
+        if kind == PM_SUMMON:
+            h_idx = (pm >> 2) & 63
+            s_idx = (pm >> 14) & 63
             if 0 <= h_idx < len(current.hand) and current.monster_zone[s_idx] is None:
-                card_id = current.hand.pop(h_idx)
-                current.monster_zone[s_idx] = card_id
+                card_id = self._hand_pop(current, h_idx)
+                self._zone_set(current, s_idx, card_id)
 
-        elif move.kind == "fusion":
-            h1 = move.params["hand_index_1"]
-            h2 = move.params["hand_index_2"]
-            s_idx = move.params["slot_index"]
+        elif kind == PM_FUSION:
+            h1 = (pm >> 2) & 63
+            h2 = (pm >> 8) & 63
+            s_idx = (pm >> 14) & 63
             if h1 == h2:
                 return
 
@@ -194,24 +779,22 @@ class GameState:
             if i2 >= len(current.hand):
                 return
 
-            c1 = current.hand[i1]
-            c2 = current.hand[i2]
-            key = tuple(sorted((c1, c2)))
-            if key not in self.fusions:
+            result_id = self.fusions.result(current.hand[i1], current.hand[i2])
+            if result_id is None:
                 return
 
-            result_id = self.fusions[key]
-
             # Quitar las cartas de la mano (cuidado con índices)
-            current.graveyard.append(current.hand.pop(i2))
-            current.graveyard.append(current.hand.pop(i1))
+            self._to_graveyard(current, self._hand_pop(current, i2))
+            self._to_graveyard(current, self._hand_pop(current, i1))
 
             if current.monster_zone[s_idx] is None:
-                current.monster_zone[s_idx] = result_id
+                self._zone_set(current, s_idx, result_id)
 
-        elif move.kind == "attack":
-            a_slot = move.params["attacker_slot"]
-            d_slot = move.params.get("defender_slot", None)
+        elif kind == PM_ATTACK:
+            a_slot = (pm >> 2) & 63
+            d_slot: Optional[int] = (pm >> 8) & 63
+            if d_slot == PM_DIRECT:
+                d_slot = None
 
             if not (0 <= a_slot < len(current.monster_zone)):
                 return
@@ -220,11 +803,9 @@ class GameState:
             if attacker_id is None:
                 return
 
-            attacker_card = self.cards[attacker_id]
-
             if d_slot is None:
                 # Ataque directo
-                opponent.life_points -= attacker_card.attack
+                self._set_life_points(opponent, opponent.life_points - self.cards[attacker_id].attack)
                 self.check_game_over()
             else:
                 if not (0 <= d_slot < len(opponent.monster_zone)):
@@ -232,24 +813,23 @@ class GameState:
                 defender_id = opponent.monster_zone[d_slot]
                 if defender_id is None:
                     return
-                defender_card = self.cards[defender_id]
-
-                if attacker_card.attack > defender_card.attack:
-                    damage = attacker_card.attack - defender_card.attack
-                    opponent.life_points -= damage
-                    opponent.graveyard.append(defender_id)
-                    opponent.monster_zone[d_slot] = None
-                elif attacker_card.attack < defender_card.attack:
-                    damage = defender_card.attack - attacker_card.attack
-                    current.life_points -= damage
-                    current.graveyard.append(attacker_id)
-                    current.monster_zone[a_slot] = None
+                # ATK del atacante - ATK del defensor (ver combat.CombatTable)
+                margin = self.combat.row(attacker_id)[defender_id]
+
+                if margin > 0:
+                    self._set_life_points(opponent, opponent.life_points - margin)
+                    self._to_graveyard(opponent, defender_id)
+                    self._zone_set(opponent, d_slot, None)
+                elif margin < 0:
+                    self._set_life_points(current, current.life_points + margin)
+                    self._to_graveyard(current, attacker_id)
+                    self._zone_set(current, a_slot, None)
                 else:
                     # se destruyen ambos
-                    opponent.graveyard.append(defender_id)
-                    current.graveyard.append(attacker_id)
-                    opponent.monster_zone[d_slot] = None
-                    current.monster_zone[a_slot] = None
+                    self._to_graveyard(opponent, defender_id)
+                    self._to_graveyard(current, attacker_id)
+                    self._zone_set(opponent, d_slot, None)
+                    self._zone_set(current, a_slot, None)
 
                 self.check_game_over()
 
@@ -259,6 +839,102 @@ class GameState:
         self.draw_card(self.get_active_player())
         self.check_game_over()
 
+    def child_features(self, moves: List[int]) -> List[Tuple[int, int, int, int]]:
+        """(LP IA, LP jugador, ATK en campo IA, ATK en campo jugador) tras cada
+        jugada válida de `moves`, calculado sin aplicarla.
+
+        Son los datos que usa la evaluación; robar carta y cambiar de turno no
+        los modifican. Solo admite jugadas de valid_moves_packed.
+        """
+        cards = self.cards
+        current = self.get_active_player()
+        opponent = self.get_opponent()
+        cur_lp, opp_lp = current.life_points, opponent.life_points
+        cur_atk, opp_atk = current.field_attack, opponent.field_attack
+        hand = current.hand
+        features = []
+        for pm in moves:
+            kind = pm & 3
+            c_lp, o_lp, c_atk, o_atk = cur_lp, opp_lp, cur_atk, opp_atk
+            if kind == PM_SUMMON:
+                c_atk += cards[hand[(pm >> 2) & 63]].attack
+            elif kind == PM_FUSION:
+                c_atk += cards[self.fusions.result(hand[(pm >> 2) & 63], hand[(pm >> 8) & 63])].attack
+            else:
+                attacker_id = current.monster_zone[(pm >> 2) & 63]
+                d_slot = (pm >> 8) & 63
+                if d_slot == PM_DIRECT:
+                    o_lp -= cards[attacker_id].attack
+                else:
+                    defender_id = opponent.monster_zone[d_slot]
+                    margin = self.combat.row(attacker_id)[defender_id]
+                    if margin >= 0:
+                        o_lp -= margin
+                        o_atk -= cards[defender_id].attack
+                    if margin <= 0:
+                        c_lp += margin
+                        c_atk -= cards[attacker_id].attack
+            if current is self.ai:
+                features.append((c_lp, o_lp, c_atk, o_atk))
+            else:
+                features.append((o_lp, c_lp, o_atk, c_atk))
+        return features
+
+
+    # ---------------------------
+    # Hacer / deshacer jugadas
+    # ---------------------------
+
+    def make_move(self, move: Union[Move, int, None]) -> UndoRecord:
+        """Aplica `move` (Move, jugada empaquetada o None = pasar turno) y
+        devuelve cómo deshacerla.
+
+        Permite a la búsqueda recorrer el árbol sobre un único estado, sin
+        copias: make_move al bajar, undo_move al volver.
+        """
+        record = UndoRecord(
+            current_turn=self.current_turn,
+            turn_count=self.turn_count,
+            finished=self.finished,
+            winner=self.winner,
+            zhash=self._zhash,
+            chash=self._chash,
+            player_lp=self.player.life_points,
+            ai_lp=self.ai.life_points,
+        )
+        self._journal = record.journal
+        try:
+            if move is None:
+                self.pass_turn()
+            elif isinstance(move, Move):
+                self.apply_move(move)
+            else:
+                self.apply_packed(move)
+        finally:
+            self._journal = None
+        return record
+
+    def undo_move(self, record: UndoRecord) -> None:
+        """Deshace la última jugada hecha con make_move (en orden LIFO)."""
+        for op, player, index, value in reversed(record.journal):
+            if op == U_DRAW:
+                player.hand.pop()
+                player.deck_pos -= 1
+            elif op == U_GRAVEYARD:
+                player.graveyard.pop()
+            elif op == U_ZONE_SET:
+                self._write_slot(player, index, value)
+            else:  # U_HAND_POP
+                player.hand.insert(index, value)
+        self.player.life_points = record.player_lp
+        self.ai.life_points = record.ai_lp
+        self.current_turn = record.current_turn
+        self.turn_count = record.turn_count
+        self.finished = record.finished
+        self.winner = record.winner
+        self._zhash = record.zhash
+        self._chash = record.chash
+
 
 # ====================================================
 # Funciones para cargar cartas / fusiones y crear un estado inicial
@@ -273,13 +949,12 @@ def load_cards(path: str) -> Dict[int, Card]:
     return cards
 
 
-def load_fusions(path: str) -> Dict[Tuple[int, int], int]:
+def load_fusions(path: str) -> FusionIndex:
     with open(path, "r", encoding="utf-8") as f:
         data = json.load(f)
-    fus: Dict[Tuple[int, int], int] = {}
+    fus = FusionIndex()
     for rule in data["fusions"]:
-        ing = tuple(sorted((rule["ingredients"][0], rule["ingredients"][1])))
-        fus[ing] = rule["result"]
+        fus[rule["ingredients"][0], rule["ingredients"][1]] = rule["result"]
     return fus
 
 
@@ -314,9 +989,10 @@ def create_initial_game_state() -> GameState:
     random.shuffle(player_deck)
     random.shuffle(ai_deck)
 
-    player = PlayerState(name="Jugador", deck=player_deck)
-    ai = PlayerState(name="IA", deck=ai_deck)
+    player = PlayerState(name="Jugador", deck_cards=tuple(player_deck))
+    ai = PlayerState(name="IA", deck_cards=tuple(ai_deck))
 
-    state = GameState(cards=cards, fusions=fusions, player=player, ai=ai)
+    state = GameState(cards=cards, fusions=fusions, player=player, ai=ai,
+                      combat=CombatTable(cards))
     state.initial_draw()
     return state
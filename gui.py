@@ -4,12 +4,17 @@ Interfaz gráfica más clara y organizada
 """
 import pygame
 import sys
+import time
 from typing import List, Optional, Tuple, Dict
 import math
+import os
+from datetime import datetime
 
 import config
 from game_models import GameState, create_initial_game_state, Move, Card
-from ai_minimax import choose_ai_move
+from ai_worker import AIWorker
+from notation import encode_position
+import profiling
 
 
 class UIStyles:
@@ -163,6 +168,11 @@ class GameApp:
         # Estado del juego
         self.state: GameState = create_initial_game_state()
         
+        # Búsqueda de la IA en segundo plano (la ventana sigue respondiendo)
+        self.ai_worker = AIWorker()
+        # S: el panel de información alterna entre instrucciones y estadísticas de la IA
+        self.show_search_stats = False
+        
         # Interacción
         self.selected_hand_indices: List[int] = []
         self.selected_attacker_slot: Optional[int] = None
@@ -227,6 +237,7 @@ class GameApp:
     # -------------------------------------------------
     def reset_game(self) -> None:
         """Reinicia el juego a su estado inicial"""
+        self.ai_worker.cancel()
         self.state = create_initial_game_state()
         self.selected_hand_indices = []
         self.selected_attacker_slot = None
@@ -235,10 +246,28 @@ class GameApp:
         self.message = "¡Nueva partida! Comienza el jugador. ¡Buena suerte!"
         self.action_history = []
         self.active_effect = None
+        self.ai_worker.stats = None
+
+    def capture_position(self) -> None:
+        """Guarda la posición actual en config.POSITIONS_FILE (una por línea),
+        lista para `--position` de los benchmarks y del perfilador"""
+        position = encode_position(self.state)
+        path = config.POSITIONS_FILE
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(f"# {datetime.now().isoformat(timespec='seconds')} "
+                    f"turno {self.state.turn_count} ({self.state.current_turn})\n")
+            f.write(position + "\n")
+        self.message = f"✅ Posición guardada en {path}"
 
     def run(self) -> None:
         """Bucle principal del juego"""
+        profiler = profiling.get_session()
         while True:
+            if profiler is not None:
+                profiler.on_frame(self)
             self.clock.tick(config.FPS)
             self.handle_events()
             
@@ -257,6 +286,16 @@ class GameApp:
                 pygame.quit()
                 sys.exit()
             
+            # P: capturar la posición (también mientras piensa la IA)
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_p:
+                self.capture_position()
+                continue
+            
+            # S: instrucciones / estadísticas de la búsqueda de la IA
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_s:
+                self.show_search_stats = not self.show_search_stats
+                continue
+            
             if self.state.finished:
                 if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                     mx, my = event.pos
@@ -353,7 +392,12 @@ class GameApp:
         elif len(self.selected_hand_indices) == 1:
             card_id = self.state.player.hand[self.selected_hand_indices[0]]
             card = self.state.cards[card_id]
-            self.message = f"Seleccionada: {card.name} (ATK: {card.attack}). Selecciona otra para FUSIONAR o presiona INVOCAR."
+            partners = self.state.fusions.partners_in_hand(self.state.player.hand, self.selected_hand_indices[0])
+            if partners:
+                names = ", ".join(self.state.cards[self.state.player.hand[j]].name for j, _ in partners)
+                self.message = f"Seleccionada: {card.name} (ATK: {card.attack}). Se fusiona con: {names}. Selecciona otra para FUSIONAR o presiona INVOCAR."
+            else:
+                self.message = f"Seleccionada: {card.name} (ATK: {card.attack}). Selecciona otra para FUSIONAR o presiona INVOCAR."
         
         else:
             idx1, idx2 = sorted(self.selected_hand_indices)
@@ -362,9 +406,8 @@ class GameApp:
             card1 = self.state.cards[card1_id]
             card2 = self.state.cards[card2_id]
             
-            fusion_key = tuple(sorted((card1_id, card2_id)))
-            if fusion_key in self.state.fusions:
-                result_id = self.state.fusions[fusion_key]
+            result_id = self.state.fusions.result(card1_id, card2_id)
+            if result_id is not None:
                 result_card = self.state.cards[result_id]
                 self.message = f"¡FUSIÓN DISPONIBLE! {card1.name} + {card2.name} = {result_card.name} (ATK: {result_card.attack})"
             else:
@@ -468,13 +511,12 @@ class GameApp:
         card1_id = player.hand[idx1]
         card2_id = player.hand[idx2]
         
-        fusion_key = tuple(sorted((card1_id, card2_id)))
+        result_id = self.state.fusions.result(card1_id, card2_id)
         
-        if fusion_key not in self.state.fusions:
+        if result_id is None:
             self.message = "Esas cartas no se pueden fusionar. Selecciona otra combinación."
             return
         
-        result_id = self.state.fusions[fusion_key]
         result_card = self.state.cards[result_id]
         card1 = self.state.cards[card1_id]
         card2 = self.state.cards[card2_id]
@@ -501,9 +543,7 @@ class GameApp:
         # Registrar acción
         self.action_history.append("Jugador pasa turno")
         
-        self.state.switch_turn()
-        self.state.draw_card(self.state.get_active_player())
-        self.state.check_game_over()
+        self.state.pass_turn()
         
         self.message = "Has terminado tu turno. Ahora juega la IA."
 
@@ -530,9 +570,14 @@ class GameApp:
             if self.active_effect['timer'] <= 0:
                 self.active_effect = None
         
-        # Turno de la IA
+        # Turno de la IA: se busca en otro hilo y se consulta en cada cuadro
         if self.state.current_turn == "ai":
-            move = choose_ai_move(self.state)
+            if not self.ai_worker.busy:
+                self.ai_worker.start(self.state)
+                self.message = "La IA está pensando..."
+            if not self.ai_worker.done():
+                return
+            move = self.ai_worker.take_result()
             
             if move is not None:
                 self.log_ai_move(move)
@@ -540,9 +585,7 @@ class GameApp:
                 self.message = "La IA ha realizado su jugada. Tu turno."
             else:
                 self.action_history.append("IA pasa turno")
-                self.state.switch_turn()
-                self.state.draw_card(self.state.get_active_player())
-                self.state.check_game_over()
+                self.state.pass_turn()
                 self.message = "La IA pasa. Tu turno."
 
     def log_ai_move(self, move: Move) -> None:
@@ -560,9 +603,8 @@ class GameApp:
             card1 = self.state.cards[card1_id]
             card2 = self.state.cards[card2_id]
             
-            fusion_key = tuple(sorted((card1_id, card2_id)))
-            if fusion_key in self.state.fusions:
-                result_id = self.state.fusions[fusion_key]
+            result_id = self.state.fusions.result(card1_id, card2_id)
+            if result_id is not None:
                 result_card = self.state.cards[result_id]
                 self.action_history.append(f"IA fusiona: {card1.name} + {card2.name} = {result_card.name}")
                 self.trigger_fusion_effect(move.params["slot_index"], True)
@@ -730,6 +772,11 @@ class GameApp:
             color = (120, 255, 150)
             bg_start = (30, 100, 50)
             bg_end = (10, 60, 30)
+        elif self.ai_worker.busy:
+            text = " IA PENSANDO" + "." * (pygame.time.get_ticks() // 300 % 4)
+            color = (255, 120, 120)
+            bg_start = (100, 30, 30)
+            bg_end = (60, 10, 10)
         else:
             text = " TURNO IA "
             color = (255, 120, 120)
@@ -892,8 +939,8 @@ class GameApp:
 
     def draw_monster_counts(self) -> None:
         """Dibuja los contadores de monstruos"""
-        ai_count = sum(1 for c in self.state.ai.monster_zone if c is not None)
-        player_count = sum(1 for c in self.state.player.monster_zone if c is not None)
+        ai_count = self.state.ai.monster_count
+        player_count = self.state.player.monster_count
         
         # IA
         ai_text = self.fonts['normal'].render(f" Monstruos: {ai_count}/5", 
@@ -1023,11 +1070,11 @@ class GameApp:
         """Dibuja los mazos boca abajo"""
         # Mazo de la IA
         ai_deck_rect = pygame.Rect(50, self.areas['ai_field'].centery - 50, 70, 100)
-        self.draw_deck_pile(ai_deck_rect, "Mazo IA", len(self.state.ai.deck), False)
+        self.draw_deck_pile(ai_deck_rect, "Mazo IA", self.state.ai.cards_left, False)
         
         # Mazo del jugador
         player_deck_rect = pygame.Rect(50, self.areas['player_field'].centery - 50, 70, 100)
-        self.draw_deck_pile(player_deck_rect, "Tu Mazo", len(self.state.player.deck), True)
+        self.draw_deck_pile(player_deck_rect, "Tu Mazo", self.state.player.cards_left, True)
 
     def draw_deck_pile(self, rect: pygame.Rect, name: str, count: int, is_player: bool) -> None:
         """Dibuja un mazo de cartas boca abajo"""
@@ -1139,11 +1186,15 @@ class GameApp:
             self.draw_tooltip_text(rect.centerx, rect.top - 10, tooltip)
 
     def draw_info_panel(self) -> None:
-        """Dibuja el panel de instrucciones"""
+        """Dibuja el panel de instrucciones (o las estadísticas de la IA si se
+        activaron con la tecla S)"""
         panel = self.areas['info_panel']
+        if self.show_search_stats:
+            self.draw_search_stats(panel)
+            return
         
         # Fondo del panel
-        self.draw_panel_background(panel, "📋 INSTRUCCIONES")
+        self.draw_panel_background(panel, "📋 INSTRUCCIONES (S: IA)")
         
         # Contenido
         y = panel.y + 45
@@ -1168,6 +1219,38 @@ class GameApp:
                 self.screen.blit(txt, (panel.x + 20, y))
             y += 20
 
+    def draw_search_stats(self, panel: pygame.Rect) -> None:
+        """Estadísticas de la última búsqueda de la IA (en vivo mientras piensa)"""
+        stats = self.ai_worker.stats
+        thinking = self.ai_worker.busy and not self.ai_worker.done()
+        self.draw_panel_background(panel, "📊 BÚSQUEDA IA (S: ayuda)")
+        if stats is None:
+            txt = self.fonts['small'].render("La IA aún no ha buscado", True,
+                                             UIStyles.COLORS['text_white'])
+            self.screen.blit(txt, (panel.x + 20, panel.y + 45))
+            return
+        
+        # Mientras piensa, el tiempo se mide desde que empezó la búsqueda
+        elapsed = time.perf_counter() - self.ai_worker.started if thinking else stats.elapsed
+        nps = stats.nodes / elapsed if elapsed > 0 else 0.0
+        gold = UIStyles.COLORS['text_gold']
+        white = UIStyles.COLORS['text_white']
+        lines = [
+            (f"Modo: {stats.mode or config.AI_ENGINE}" + (" (pensando...)" if thinking else ""), gold),
+            (f"Profundidad: {stats.depth}  (máx. {stats.max_depth})", white),
+            (f"Nodos: {stats.nodes:,}  Hojas: {stats.leaves:,}", white),
+            (f"Ramificación: {stats.branching_factor:.2f}", white),
+            (f"Podas: {stats.cutoffs:,}  (1ª jugada {stats.first_move_cutoff_rate:.0%})", white),
+            (f"Tabla: {stats.tt_hits:,}/{stats.tt_probes:,} ({stats.tt_hit_rate:.0%})", white),
+            (f"Tiempo: {elapsed * 1000:.0f} ms  ({nps:,.0f} nodos/s)", white),
+        ]
+        
+        y = panel.y + 45
+        for text, color in lines:
+            txt = self.fonts['small'].render(text, True, color)
+            self.screen.blit(txt, (panel.x + 20, y))
+            y += 20
+
     def draw_deck_panel(self) -> None:
         """Dibuja el panel de información de mazos"""
         panel = self.areas['deck_panel']
@@ -1179,7 +1262,7 @@ class GameApp:
         y = panel.y + 45
         
         # Mazo del jugador
-        player_text = self.fonts['normal'].render(f"Tu Mazo: {len(self.state.player.deck)}", 
+        player_text = self.fonts['normal'].render(f"Tu Mazo: {self.state.player.cards_left}", 
                                                 True, UIStyles.COLORS['player_primary'])
         self.screen.blit(player_text, (panel.x + 20, y))
         y += 25
@@ -1195,7 +1278,7 @@ class GameApp:
         y += 10
         
         # Mazo de la IA
-        ai_text = self.fonts['normal'].render(f"Mazo IA: {len(self.state.ai.deck)}", 
+        ai_text = self.fonts['normal'].render(f"Mazo IA: {self.state.ai.cards_left}", 
                                             True, UIStyles.COLORS['ai_primary'])
         self.screen.blit(ai_text, (panel.x + 20, y))
         y += 25
@@ -1340,9 +1423,8 @@ class GameApp:
             card1 = self.state.cards[card1_id]
             card2 = self.state.cards[card2_id]
             
-            fusion_key = tuple(sorted((card1_id, card2_id)))
-            if fusion_key in self.state.fusions:
-                result_id = self.state.fusions[fusion_key]
+            result_id = self.state.fusions.result(card1_id, card2_id)
+            if result_id is not None:
                 result_card = self.state.cards[result_id]
                 feedback = f" FUSIÓN DISPONIBLE: {result_card.name} (ATK: {result_card.attack})"
                 color = UIStyles.COLORS['btn_fusion']
@@ -1546,8 +1628,8 @@ class GameApp:
             f"Turnos jugados: {self.state.turn_count}",
             f"LP Jugador: {self.state.player.life_points}",
             f"LP IA: {self.state.ai.life_points}",
-            f"Cartas en mazo Jugador: {len(self.state.player.deck)}",
-            f"Cartas en mazo IA: {len(self.state.ai.deck)}",
+            f"Cartas en mazo Jugador: {self.state.player.cards_left}",
+            f"Cartas en mazo IA: {self.state.ai.cards_left}",
         ]
         
         for stat in stats:
@@ -1,7 +1,40 @@
-from gui import GameApp
+import argparse
 
+import config
+import profiling
 
-def main():
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Yu-Gi-Oh! Forbidden Memories con IA")
+    parser.add_argument("--headless", action="store_true",
+                        help="jugar partidas IA contra IA sin interfaz gráfica")
+    parser.add_argument("--games", type=int, default=config.SIM_GAMES,
+                        help="partidas a simular (con --headless)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="semilla de la primera partida (con --headless)")
+    parser.add_argument("--max-turns", type=int, default=config.SIM_MAX_TURNS,
+                        help="turnos tras los que una partida cuenta como empate (con --headless)")
+    parser.add_argument("--profile", action="store_true",
+                        help=f"perfilar cuadros y jugadas de la IA (o {profiling.ENV_VAR}=1)")
+    parser.add_argument("--profile-start", type=int, default=config.PROFILE_START_FRAME,
+                        help="primer cuadro perfilado")
+    parser.add_argument("--profile-frames", type=int, default=config.PROFILE_FRAMES,
+                        help="cuadros perfilados (0 = solo la IA)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.headless:
+        # Sin pygame: solo las reglas de GameState y los motores de IA
+        from simulator import format_report, simulate
+        print(format_report(simulate(args.games, args.seed, args.max_turns)))
+        return
+
+    if args.profile or config.PROFILE or profiling.enabled_from_env():
+        profiling.start_session(args.profile_start, args.profile_frames)
+
+    from gui import GameApp
     app = GameApp()
     app.run()
 
@@ -0,0 +1,93 @@
+"""
+Ordenación de jugadas para la búsqueda alfa-beta.
+
+La poda es mayor cuanto antes se prueba la mejor jugada. Orden usado:
+  1. la jugada de la tabla de transposición;
+  2. ataques que destruyen sin perder el atacante (por daño + ATK destruido)
+     y ataques directos (por daño);
+  3. fusiones (por ATK del resultado);
+  4. jugadas "killer": las que provocaron una poda a la misma distancia de la raíz;
+  5. el resto, por puntuación histórica (cortes acumulados) y ATK invocado;
+  6. ataques que solo pierden el atacante.
+"""
+from typing import Dict, List, Optional, Tuple
+
+from game_models import GameState, PM_ATTACK, PM_DIRECT, PM_FUSION
+
+# Niveles de prioridad
+TIER_TT = 5
+TIER_WINNING_ATTACK = 4
+TIER_FUSION = 3
+TIER_KILLER = 2
+TIER_QUIET = 1
+TIER_LOSING_ATTACK = 0
+
+
+class MoveOrderer:
+    """Ordena jugadas y aprende heurísticas killer e histórica durante una búsqueda.
+
+    Se crea uno por búsqueda (o por profundización iterativa completa: el
+    historial aprendido en una iteración sirve a la siguiente).
+    """
+
+    def __init__(self) -> None:
+        # Las jugadas son enteros empaquetados (game_models.pack_*)
+        self.killers: List[List[Optional[int]]] = []
+        self.history: Dict[int, int] = {}
+
+    def static_score(self, state: GameState, move: int) -> Tuple[int, int]:
+        """(nivel, valor) de una jugada sin tener en cuenta lo aprendido."""
+        cards = state.cards
+        current = state.get_active_player()
+        kind = move & 3
+        if kind == PM_ATTACK:
+            attacker_id = current.monster_zone[(move >> 2) & 63]
+            d_slot = (move >> 8) & 63
+            if d_slot == PM_DIRECT:
+                return TIER_WINNING_ATTACK, cards[attacker_id].attack
+            defender_id = state.get_opponent().monster_zone[d_slot]
+            margin = state.combat.row(attacker_id)[defender_id]
+            if margin > 0:
+                # daño + ATK destruido
+                return TIER_WINNING_ATTACK, margin + cards[defender_id].attack
+            if margin == 0:
+                return TIER_QUIET, 0
+            return TIER_LOSING_ATTACK, margin
+        if kind == PM_FUSION:
+            c1 = current.hand[(move >> 2) & 63]
+            c2 = current.hand[(move >> 8) & 63]
+            result = state.fusions.result(c1, c2)
+            return TIER_FUSION, cards[result].attack if result is not None else 0
+        # summon
+        return TIER_QUIET, cards[current.hand[(move >> 2) & 63]].attack
+
+    def order(self, state: GameState, moves: List[int], ply: int,
+              tt_move: Optional[int] = None) -> List[int]:
+        """Devuelve `moves` de la más a la menos prometedora (orden estable)."""
+        killers = self.killers[ply] if ply < len(self.killers) else ()
+        history = self.history
+
+        def score(m: int) -> Tuple[int, int, int]:
+            if tt_move is not None and m == tt_move:
+                return TIER_TT, 0, 0
+            tier, value = self.static_score(state, m)
+            if tier >= TIER_FUSION:
+                return tier, value, 0
+            if m in killers:
+                return TIER_KILLER, 1 if m == killers[0] else 0, 0
+            return tier, history.get(m, 0), value
+
+        return sorted(moves, key=score, reverse=True)
+
+    def record_cutoff(self, state: GameState, move: int, ply: int, depth: int) -> None:
+        """Registra que `move` provocó una poda con `depth` de profundidad restante."""
+        tier, _ = self.static_score(state, move)
+        if tier >= TIER_FUSION:
+            return  # ya se ordenan primero por sí mismas
+        while len(self.killers) <= ply:
+            self.killers.append([None, None])
+        slot = self.killers[ply]
+        if slot[0] != move:
+            slot[1] = slot[0]
+            slot[0] = move
+        self.history[move] = self.history.get(move, 0) + depth * depth
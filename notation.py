@@ -0,0 +1,215 @@
+"""
+Notación compacta de posiciones (al estilo FEN) y su forma binaria.
+
+Texto: cinco campos separados por espacios,
+
+    <turno> <turnos jugados> <jugador> <IA> <resultado>
+
+  - turno: "p" (jugador) o "a" (IA);
+  - resultado: "-" en juego, "p"/"a"/"d" si ganó el jugador, la IA o hubo
+    empate, "f" si terminó sin ganador;
+  - cada bando es LP/mazo/mano/campo/cementerio, con las cartas por id
+    separadas por puntos:
+      mazo: el mazo completo, con "*" delante de la próxima carta a robar;
+      campo: las config.MAX_MONSTERS casillas, "_" = vacía;
+      mano y cementerio: "-" si están vacíos.
+
+    p 0 8000/12.45*3.9/7.1.22/_._._._._/- 8000/*5.8.61/33.2/_._._._._/- -
+
+`decode_position(encode_position(s)) == s` para cualquier GameState `s`
+(mismas cartas y fusiones), y lo mismo con `pack_position`/`unpack_position`,
+que guardan los mismos datos en binario con `struct` para cuando hay que
+guardar o enviar muchas posiciones. Al decodificar muchas, conviene pasar
+las mismas cartas, fusiones y tabla de combates a todas: si no, cada una
+carga las suyas.
+"""
+import struct
+from typing import Dict, List, Optional, Tuple
+
+import config
+from combat import CombatTable
+from game_models import (Card, FusionIndex, GameState, PlayerState, load_cards,
+                         load_fusions)
+
+_TURNS = {"p": "player", "a": "ai"}
+_RESULTS = {"-": (False, None), "p": (True, "player"), "a": (True, "ai"),
+            "d": (True, "draw"), "f": (True, None)}
+_RESULT_CODES = "-padf"                    # orden de los resultados en la forma binaria
+_NAMES = {"player": "Jugador", "ai": "IA"}
+
+# Forma binaria: cabecera y, por bando, LP + longitudes; las cartas van como uint16
+_MAGIC = b"YG\x01"
+_HEADER = struct.Struct("<3sBBH")          # magia, turno, resultado, turnos jugados
+_PLAYER = struct.Struct("<iBBBBH")         # LP, mazo, robadas, mano, campo, cementerio
+_EMPTY_SLOT = 0xFFFF
+
+
+def _ids(items: List[int]) -> str:
+    return ".".join(map(str, items)) if items else "-"
+
+
+def _encode_player(p: PlayerState) -> str:
+    drawn = ".".join(map(str, p.deck_cards[:p.deck_pos]))
+    remaining = ".".join(map(str, p.deck_cards[p.deck_pos:]))
+    zone = ".".join("_" if cid is None else str(cid) for cid in p.monster_zone)
+    return f"{p.life_points}/{drawn}*{remaining}/{_ids(p.hand)}/{zone}/{_ids(p.graveyard)}"
+
+
+def _result(state: GameState) -> str:
+    if not state.finished:
+        return "-"
+    return {"player": "p", "ai": "a", "draw": "d", None: "f"}[state.winner]
+
+
+def encode_position(state: GameState) -> str:
+    """Posición de `state` en una sola línea de texto."""
+    turn = "p" if state.current_turn == "player" else "a"
+    return (f"{turn} {state.turn_count} {_encode_player(state.player)} "
+            f"{_encode_player(state.ai)} {_result(state)}")
+
+
+def _parse_ids(text: str, cards: Dict[int, Card], what: str) -> List[int]:
+    if text in ("", "-"):
+        return []
+    try:
+        ids = [int(t) for t in text.split(".")]
+    except ValueError:
+        raise ValueError(f"{what}: se esperaban ids de carta separados por puntos: {text!r}") from None
+    unknown = [cid for cid in ids if cid not in cards]
+    if unknown:
+        raise ValueError(f"{what}: cartas desconocidas {unknown}")
+    return ids
+
+
+def _decode_player(text: str, side: str, cards: Dict[int, Card]) -> PlayerState:
+    parts = text.split("/")
+    if len(parts) != 5:
+        raise ValueError(f"{side}: se esperaban 5 campos LP/mazo/mano/campo/cementerio: {text!r}")
+    lp, deck, hand, zone, graveyard = parts
+    if deck.count("*") != 1:
+        raise ValueError(f"{side}: el mazo debe marcar con un '*' la próxima carta: {deck!r}")
+    drawn, remaining = deck.split("*")
+    drawn_ids = _parse_ids(drawn, cards, f"{side} (mazo)")
+    slots = zone.split(".")
+    if len(slots) != config.MAX_MONSTERS:
+        raise ValueError(f"{side}: el campo tiene {len(slots)} casillas y no {config.MAX_MONSTERS}")
+    monster_zone: List[Optional[int]] = []
+    for slot in slots:
+        if slot == "_":
+            monster_zone.append(None)
+        elif slot.isdigit():
+            monster_zone.extend(_parse_ids(slot, cards, f"{side} (campo)"))
+        else:
+            raise ValueError(f"{side}: casilla del campo no válida (un id o '_'): {slot!r}")
+    try:
+        life_points = int(lp)
+    except ValueError:
+        raise ValueError(f"{side}: LP no válidos: {lp!r}") from None
+    return PlayerState(
+        name=_NAMES[side],
+        life_points=life_points,
+        deck_cards=tuple(drawn_ids + _parse_ids(remaining, cards, f"{side} (mazo)")),
+        deck_pos=len(drawn_ids),
+        hand=_parse_ids(hand, cards, f"{side} (mano)"),
+        monster_zone=monster_zone,
+        graveyard=_parse_ids(graveyard, cards, f"{side} (cementerio)"),
+    )
+
+
+def _tables(cards: Optional[Dict[int, Card]], fusions: Optional[FusionIndex],
+            combat: Optional[CombatTable]) -> Tuple[Dict[int, Card], FusionIndex, CombatTable]:
+    """Cartas, fusiones y combates dados o, si faltan, los de los archivos de config."""
+    if cards is None:
+        cards = load_cards(config.CARDS_FILE)
+    if fusions is None:
+        fusions = load_fusions(config.FUSIONS_FILE)
+    if combat is None:
+        combat = CombatTable(cards)
+    return cards, fusions, combat
+
+
+def decode_position(text: str, cards: Optional[Dict[int, Card]] = None,
+                    fusions: Optional[FusionIndex] = None,
+                    combat: Optional[CombatTable] = None) -> GameState:
+    """GameState de una posición de `encode_position`. Lanza ValueError si
+    el texto no es válido."""
+    cards, fusions, combat = _tables(cards, fusions, combat)
+    fields = text.split()
+    if len(fields) != 5:
+        raise ValueError(f"Se esperaban 5 campos (turno, turnos, jugador, IA, resultado): {text!r}")
+    turn, turn_count, player, ai, result = fields
+    if turn not in _TURNS or result not in _RESULTS or not turn_count.isdigit():
+        raise ValueError(f"Turno, turnos jugados o resultado no válidos: {text!r}")
+    finished, winner = _RESULTS[result]
+    return GameState(cards=cards, fusions=fusions,
+                     player=_decode_player(player, "player", cards),
+                     ai=_decode_player(ai, "ai", cards),
+                     current_turn=_TURNS[turn], finished=finished, winner=winner,
+                     turn_count=int(turn_count), combat=combat)
+
+
+# ---------------------------
+# Forma binaria
+# ---------------------------
+
+def pack_position(state: GameState) -> bytes:
+    """Los mismos datos que `encode_position`, en binario (ids de carta < 65535)."""
+    header = _HEADER.pack(_MAGIC, state.current_turn == "ai", _RESULT_CODES.index(_result(state)),
+                          state.turn_count)
+    chunks = [header]
+    for p in (state.player, state.ai):
+        ids = (list(p.deck_cards) + p.hand
+               + [_EMPTY_SLOT if cid is None else cid for cid in p.monster_zone]
+               + p.graveyard)
+        chunks.append(_PLAYER.pack(p.life_points, len(p.deck_cards), p.deck_pos,
+                                   len(p.hand), len(p.monster_zone), len(p.graveyard)))
+        chunks.append(struct.pack(f"<{len(ids)}H", *ids))
+    return b"".join(chunks)
+
+
+def unpack_position(data: bytes, cards: Optional[Dict[int, Card]] = None,
+                    fusions: Optional[FusionIndex] = None,
+                    combat: Optional[CombatTable] = None) -> GameState:
+    """GameState de `pack_position`. Lanza ValueError si los datos no son válidos."""
+    cards, fusions, combat = _tables(cards, fusions, combat)
+    try:
+        magic, ai_turn, result, turn_count = _HEADER.unpack_from(data, 0)
+        if magic != _MAGIC or ai_turn > 1 or result > 4:
+            raise ValueError("cabecera desconocida")
+        offset = _HEADER.size
+        players = []
+        for side in ("player", "ai"):
+            lp, n_deck, deck_pos, n_hand, n_zone, n_grave = _PLAYER.unpack_from(data, offset)
+            offset += _PLAYER.size
+            n = n_deck + n_hand + n_zone + n_grave
+            ids = list(struct.unpack_from(f"<{n}H", data, offset))
+            offset += 2 * n
+            if n_zone != config.MAX_MONSTERS or deck_pos > n_deck:
+                raise ValueError(f"{side}: campo o mazo incoherentes")
+            zone = [None if cid == _EMPTY_SLOT else cid
+                    for cid in ids[n_deck + n_hand:n_deck + n_hand + n_zone]]
+            if any(cid not in cards for cid in ids if cid != _EMPTY_SLOT):
+                raise ValueError(f"{side}: cartas desconocidas")
+            players.append(PlayerState(
+                name=_NAMES[side], life_points=lp, deck_cards=tuple(ids[:n_deck]),
+                deck_pos=deck_pos, hand=ids[n_deck:n_deck + n_hand], monster_zone=zone,
+                graveyard=ids[n_deck + n_hand + n_zone:],
+            ))
+        if offset != len(data):
+            raise ValueError("sobran bytes al final")
+    except struct.error as exc:
+        raise ValueError(f"Posición binaria truncada: {exc}") from None
+    finished, winner = _RESULTS[_RESULT_CODES[result]]
+    return GameState(cards=cards, fusions=fusions, player=players[0], ai=players[1],
+                     current_turn="ai" if ai_turn else "player", finished=finished,
+                     winner=winner, turn_count=turn_count, combat=combat)
+
+
+# ---------------------------
+# Archivos de posiciones
+# ---------------------------
+
+def load_positions(path: str) -> List[str]:
+    """Posiciones de un archivo de texto (una por línea; '#' = comentario)."""
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
@@ -0,0 +1,302 @@
+"""
+Variante persistente (inmutable) del estado de la partida.
+
+`FrozenGameState.apply_packed` no modifica el estado: devuelve uno nuevo que
+comparte con el anterior todo lo que la jugada no toca. Las tuplas de mano,
+campo y cementerio solo se copian cuando cambian, el mazo completo se comparte
+siempre y un jugador al que la jugada no afecta se reutiliza tal cual. Así un
+historial de partida o un árbol de búsqueda puede guardar miles de estados por
+una fracción de lo que cuestan las copias de `GameState.clone`.
+
+Las reglas son las de `GameState.apply_packed`; `freeze`/`thaw` convierten
+entre ambas representaciones y el hash de Zobrist coincide con el del estado
+mutable equivalente.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from combat import CombatTable
+from game_models import (
+    Card, FusionIndex, GameState, Move, PlayerState,
+    PM_ATTACK, PM_DIRECT, PM_FUSION, PM_SUMMON,
+    Z_DECK, Z_HAND, Z_LP, Z_TURN, Z_ZONE,
+    pack_attack, pack_fusion, pack_summon, zobrist_key,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class FrozenPlayer:
+    name: str
+    life_points: int
+    deck_cards: Tuple[int, ...]
+    deck_pos: int
+    hand: Tuple[int, ...]
+    monster_zone: Tuple[Optional[int], ...]
+    graveyard: Tuple[int, ...]
+    field_attack: int
+    field_defense: int
+    monster_count: int
+
+    @property
+    def deck(self) -> Tuple[int, ...]:
+        return self.deck_cards[self.deck_pos:]
+
+    @property
+    def cards_left(self) -> int:
+        return len(self.deck_cards) - self.deck_pos
+
+    @staticmethod
+    def freeze(p: PlayerState) -> "FrozenPlayer":
+        return FrozenPlayer(p.name, p.life_points, p.deck_cards, p.deck_pos, tuple(p.hand),
+                            tuple(p.monster_zone), tuple(p.graveyard),
+                            p.field_attack, p.field_defense, p.monster_count)
+
+    def thaw(self) -> PlayerState:
+        return PlayerState(name=self.name, life_points=self.life_points,
+                           deck_cards=self.deck_cards, deck_pos=self.deck_pos,
+                           hand=list(self.hand), monster_zone=list(self.monster_zone),
+                           graveyard=list(self.graveyard), field_attack=self.field_attack,
+                           field_defense=self.field_defense, monster_count=self.monster_count)
+
+    def zobrist(self, side: int) -> int:
+        """Mismo hash que PlayerState.zobrist."""
+        h = zobrist_key(side, Z_LP, 0, self.life_points)
+        for i, cid in enumerate(self.hand):
+            h ^= zobrist_key(side, Z_HAND, i, cid)
+        for i, cid in enumerate(self.monster_zone):
+            if cid is not None:
+                h ^= zobrist_key(side, Z_ZONE, i, cid)
+        n = len(self.deck_cards)
+        for i in range(self.deck_pos, n):
+            h ^= zobrist_key(side, Z_DECK, n - 1 - i, self.deck_cards[i])
+        return h
+
+    # ---------------------------
+    # Copias con un cambio (el resto se comparte)
+    # ---------------------------
+
+    def with_life_points(self, value: int) -> "FrozenPlayer":
+        return FrozenPlayer(self.name, value, self.deck_cards, self.deck_pos, self.hand,
+                            self.monster_zone, self.graveyard,
+                            self.field_attack, self.field_defense, self.monster_count)
+
+    def with_hand(self, hand: Tuple[int, ...], graveyard: Tuple[int, ...]) -> "FrozenPlayer":
+        return FrozenPlayer(self.name, self.life_points, self.deck_cards, self.deck_pos, hand,
+                            self.monster_zone, graveyard,
+                            self.field_attack, self.field_defense, self.monster_count)
+
+    def with_slot(self, cards: Dict[int, Card], slot: int, card_id: Optional[int],
+                  graveyard: Optional[Tuple[int, ...]] = None) -> "FrozenPlayer":
+        """Escribe una casilla del campo manteniendo los totales (y, si se pasa, el cementerio)."""
+        atk, dfn, count = self.field_attack, self.field_defense, self.monster_count
+        old = self.monster_zone[slot]
+        if old is not None:
+            atk -= cards[old].attack
+            dfn -= cards[old].defense
+            count -= 1
+        if card_id is not None:
+            atk += cards[card_id].attack
+            dfn += cards[card_id].defense
+            count += 1
+        zone = self.monster_zone[:slot] + (card_id,) + self.monster_zone[slot + 1:]
+        return FrozenPlayer(self.name, self.life_points, self.deck_cards, self.deck_pos, self.hand,
+                            zone, self.graveyard if graveyard is None else graveyard,
+                            atk, dfn, count)
+
+    def drawn(self) -> "FrozenPlayer":
+        """Copia tras robar la carta de arriba del mazo (el mismo objeto si está vacío)."""
+        if self.deck_pos >= len(self.deck_cards):
+            return self
+        return FrozenPlayer(self.name, self.life_points, self.deck_cards, self.deck_pos + 1,
+                            self.hand + (self.deck_cards[self.deck_pos],), self.monster_zone,
+                            self.graveyard, self.field_attack, self.field_defense,
+                            self.monster_count)
+
+
+def _outcome(player: FrozenPlayer, ai: FrozenPlayer,
+             finished: bool, winner: Optional[str]) -> Tuple[bool, Optional[str]]:
+    """Lo mismo que GameState.check_game_over, sin modificar nada."""
+    if player.life_points <= 0 and ai.life_points <= 0:
+        return True, "draw"
+    if player.life_points <= 0:
+        return True, "ai"
+    if ai.life_points <= 0:
+        return True, "player"
+    return finished, winner
+
+
+@dataclass(frozen=True, slots=True)
+class FrozenGameState:
+    cards: Dict[int, Card]
+    fusions: FusionIndex
+    player: FrozenPlayer
+    ai: FrozenPlayer
+    current_turn: str = "player"
+    finished: bool = False
+    winner: Optional[str] = None
+    combat: Optional[CombatTable] = field(default=None, repr=False, compare=False)
+    turn_count: int = 0
+    # Hash de Zobrist, calculado la primera vez que se pide
+    _zhash: Optional[int] = field(default=None, repr=False, compare=False)
+
+    @staticmethod
+    def freeze(state: GameState) -> "FrozenGameState":
+        return FrozenGameState(state.cards, state.fusions, FrozenPlayer.freeze(state.player),
+                               FrozenPlayer.freeze(state.ai), state.current_turn,
+                               state.finished, state.winner, state.combat, state.turn_count)
+
+    def thaw(self) -> GameState:
+        """GameState mutable equivalente (p. ej. para buscar con make_move/undo_move)."""
+        return GameState(cards=self.cards, fusions=self.fusions, player=self.player.thaw(),
+                         ai=self.ai.thaw(), current_turn=self.current_turn,
+                         finished=self.finished, winner=self.winner, combat=self.combat,
+                         turn_count=self.turn_count)
+
+    def zobrist_hash(self) -> int:
+        if self._zhash is None:
+            h = self.player.zobrist(0) ^ self.ai.zobrist(1)
+            if self.current_turn == "ai":
+                h ^= zobrist_key(0, Z_TURN, 0, 0)
+            object.__setattr__(self, "_zhash", h)
+        return self._zhash
+
+    def get_active_player(self) -> FrozenPlayer:
+        return self.player if self.current_turn == "player" else self.ai
+
+    def get_opponent(self) -> FrozenPlayer:
+        return self.ai if self.current_turn == "player" else self.player
+
+    # ---------------------------
+    # Generación de jugadas
+    # ---------------------------
+
+    def valid_moves(self) -> List[Move]:
+        return [Move.from_packed(pm) for pm in self.valid_moves_packed()]
+
+    def valid_moves_packed(self) -> List[int]:
+        """Mismas jugadas y mismo orden que GameState.valid_moves_packed."""
+        if self.finished:
+            return []
+        moves: List[int] = []
+        current = self.get_active_player()
+        opponent = self.get_opponent()
+        hand = current.hand
+
+        free_slots = [i for i, c in enumerate(current.monster_zone) if c is None]
+        if free_slots:
+            slot = free_slots[0]
+            moves.extend(pack_summon(i, slot) for i in range(len(hand)))
+            for i, j, _ in self.fusions.hand_pairs(hand):
+                moves.append(pack_fusion(i, j, slot))
+
+        attacker_slots = [i for i, cid in enumerate(current.monster_zone) if cid is not None]
+        opponent_slots = [i for i, cid in enumerate(opponent.monster_zone) if cid is not None]
+        for a in attacker_slots:
+            if opponent_slots:
+                moves.extend(pack_attack(a, d) for d in opponent_slots)
+            else:
+                moves.append(pack_attack(a, None))
+        return moves
+
+    # ---------------------------
+    # Aplicar jugadas (devuelven un estado nuevo)
+    # ---------------------------
+
+    def apply_move(self, move: Move) -> "FrozenGameState":
+        return self.apply_packed(move.to_packed())
+
+    def apply_packed(self, pm: int) -> "FrozenGameState":
+        """Estado tras la jugada empaquetada `pm` (self no cambia).
+
+        Las jugadas que GameState.apply_packed ignora sin pasar turno
+        devuelven el propio `self`.
+        """
+        if self.finished:
+            return self
+
+        cards = self.cards
+        current = self.get_active_player()
+        opponent = self.get_opponent()
+        finished, winner = self.finished, self.winner
+        kind = pm & 3
+
+        if kind == PM_SUMMON:
+            h_idx = (pm >> 2) & 63
+            s_idx = (pm >> 14) & 63
+            if 0 <= h_idx < len(current.hand) and current.monster_zone[s_idx] is None:
+                card_id = current.hand[h_idx]
+                current = current.with_hand(current.hand[:h_idx] + current.hand[h_idx + 1:],
+                                            current.graveyard)
+                current = current.with_slot(cards, s_idx, card_id)
+
+        elif kind == PM_FUSION:
+            h1 = (pm >> 2) & 63
+            h2 = (pm >> 8) & 63
+            s_idx = (pm >> 14) & 63
+            if h1 == h2:
+                return self
+            i1, i2 = (h1, h2) if h1 < h2 else (h2, h1)
+            hand = current.hand
+            if i2 >= len(hand):
+                return self
+            c1, c2 = hand[i1], hand[i2]
+            result_id = self.fusions.result(c1, c2)
+            if result_id is None:
+                return self
+            current = current.with_hand(hand[:i1] + hand[i1 + 1:i2] + hand[i2 + 1:],
+                                        current.graveyard + (c2, c1))
+            if current.monster_zone[s_idx] is None:
+                current = current.with_slot(cards, s_idx, result_id)
+
+        elif kind == PM_ATTACK:
+            a_slot = (pm >> 2) & 63
+            d_slot = (pm >> 8) & 63
+            if not (0 <= a_slot < len(current.monster_zone)):
+                return self
+            attacker_id = current.monster_zone[a_slot]
+            if attacker_id is None:
+                return self
+            if d_slot == PM_DIRECT:
+                opponent = opponent.with_life_points(opponent.life_points - cards[attacker_id].attack)
+            else:
+                if not (0 <= d_slot < len(opponent.monster_zone)):
+                    return self
+                defender_id = opponent.monster_zone[d_slot]
+                if defender_id is None:
+                    return self
+                margin = self.combat.row(attacker_id)[defender_id]
+                if margin > 0:
+                    opponent = opponent.with_life_points(opponent.life_points - margin)
+                    opponent = opponent.with_slot(cards, d_slot, None,
+                                                  opponent.graveyard + (defender_id,))
+                elif margin < 0:
+                    current = current.with_life_points(current.life_points + margin)
+                    current = current.with_slot(cards, a_slot, None,
+                                                current.graveyard + (attacker_id,))
+                else:
+                    opponent = opponent.with_slot(cards, d_slot, None,
+                                                  opponent.graveyard + (defender_id,))
+                    current = current.with_slot(cards, a_slot, None,
+                                                current.graveyard + (attacker_id,))
+            if self.current_turn == "player":
+                finished, winner = _outcome(current, opponent, finished, winner)
+            else:
+                finished, winner = _outcome(opponent, current, finished, winner)
+
+        # Cambio de turno: el rival pasa a ser el jugador activo y roba
+        return self._next_turn(current, opponent.drawn(), finished, winner)
+
+    def pass_turn(self) -> "FrozenGameState":
+        """Igual que GameState.pass_turn, sin modificar self."""
+        return self._next_turn(self.get_active_player(), self.get_opponent().drawn(),
+                               self.finished, self.winner)
+
+    def _next_turn(self, current: FrozenPlayer, opponent: FrozenPlayer,
+                   finished: bool, winner: Optional[str]) -> "FrozenGameState":
+        if self.current_turn == "player":
+            player, ai, turn = current, opponent, "ai"
+        else:
+            player, ai, turn = opponent, current, "player"
+        finished, winner = _outcome(player, ai, finished, winner)
+        return FrozenGameState(self.cards, self.fusions, player, ai, turn, finished, winner,
+                               self.combat, self.turn_count + 1)
@@ -0,0 +1,272 @@
+"""
+Perfilado opcional de la GUI y de la IA, sin tocar el código.
+
+Se activa con `python main.py --profile`, con la variable de entorno
+YGO_PROFILE=1 o con `config.PROFILE`. Cada sesión escribe en
+`config.PROFILE_DIR/<fecha-hora>/`:
+
+  - frames.prof / frames.collapsed: la ventana de cuadros
+    (`config.PROFILE_START_FRAME`, `config.PROFILE_FRAMES`) del hilo de la GUI;
+  - frames_draw.txt: tiempo de cada método draw_* de GameApp en esa ventana
+    (inclusivo: los draw_* llamados desde otro cuentan también en el de fuera);
+  - ai-001.prof / ai-001.collapsed ...: cada choose_ai_move por separado.
+
+Los .prof son de cProfile (`python -m pstats`, snakeviz...). Los .collapsed
+son pilas muestreadas cada `config.PROFILE_SAMPLE_MS` en formato
+"a;b;c N", el que leen flamegraph.pl o speedscope.
+
+También se puede perfilar la IA sobre las posiciones de los benchmarks:
+
+    python profiling.py --depth 4 --positions 5
+    python profiling.py --depth 5 --position logs/positions.txt
+"""
+import argparse
+import atexit
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+import config
+
+ENV_VAR = "YGO_PROFILE"
+
+
+class StackSampler:
+    """Muestrea la pila de un hilo cada `interval_ms` y cuenta las pilas colapsadas."""
+
+    def __init__(self, thread_id: int, interval_ms: float) -> None:
+        self.thread_id = thread_id
+        self.interval = interval_ms / 1000.0
+        self.counts: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack: List[str] = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.counts[";".join(reversed(stack))] += 1
+
+    def write(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.counts.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+@contextmanager
+def _profiled(directory: str, name: str) -> Iterator[None]:
+    """cProfile y muestreo de pilas del hilo actual mientras dura el bloque;
+    al salir escribe `name`.prof y `name`.collapsed en `directory`."""
+    sampler = StackSampler(threading.get_ident(), config.PROFILE_SAMPLE_MS)
+    profiler: Optional[cProfile.Profile] = cProfile.Profile()
+    sampler.start()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Desde Python 3.12 solo puede haber un cProfile activo a la vez (p. ej.
+        # la IA piensa durante la ventana de cuadros): queda solo el muestreo
+        profiler = None
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        sampler.stop()
+        if profiler is not None:
+            profiler.dump_stats(os.path.join(directory, f"{name}.prof"))
+        sampler.write(os.path.join(directory, f"{name}.collapsed"))
+
+
+def top_functions(paths: List[str], limit: int = 10) -> str:
+    """Las `limit` funciones con más tiempo propio sumando varios .prof, como texto."""
+    out = io.StringIO()
+    pstats.Stats(*paths, stream=out).sort_stats("tottime").print_stats(limit)
+    return out.getvalue()
+
+
+class ProfileSession:
+    """Una sesión de perfilado: una carpeta con la ventana de cuadros y las
+    llamadas a la IA."""
+
+    def __init__(self, start_frame: int = 0, frames: int = 0, profile_ai: bool = True,
+                 root: Optional[str] = None) -> None:
+        self.start_frame = start_frame
+        self.frames = frames
+        self.profile_ai = profile_ai
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        self.directory = os.path.join(root or config.PROFILE_DIR, stamp)
+        os.makedirs(self.directory, exist_ok=True)
+        self.frame = 0
+        self.ai_calls = 0
+        self._lock = threading.Lock()
+        self._window = None
+        self._app: Any = None
+        self._draw_times: Dict[str, float] = {}
+        self._draw_calls: Counter = Counter()
+        atexit.register(self.close)
+
+    # ---------------------------
+    # Ventana de cuadros de la GUI
+    # ---------------------------
+
+    def on_frame(self, app: Any) -> None:
+        """Llamar al principio de cada cuadro del bucle principal."""
+        if self.frame == self.start_frame and self.frames > 0:
+            self._begin_window(app)
+        elif self.frame == self.start_frame + self.frames:
+            self._end_window()
+        self.frame += 1
+
+    def _begin_window(self, app: Any) -> None:
+        self._app = app
+        # Cada draw_* de la instancia se sustituye por una versión cronometrada
+        for name, attr in vars(type(app)).items():
+            if name.startswith("draw_") and callable(attr):
+                setattr(app, name, self._timed(name, getattr(app, name)))
+        self._window = _profiled(self.directory, "frames")
+        self._window.__enter__()
+        print(f"[perfil] cuadros {self.start_frame}-{self.start_frame + self.frames - 1} "
+              f"-> {self.directory}")
+
+    def _timed(self, name: str, method):
+        times, calls = self._draw_times, self._draw_calls
+
+        def timed(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                times[name] = times.get(name, 0.0) + time.perf_counter() - t0
+                calls[name] += 1
+        return timed
+
+    def _end_window(self) -> None:
+        if self._window is None:
+            return
+        window, self._window = self._window, None
+        window.__exit__(None, None, None)
+        # Se vuelve a los métodos de la clase
+        for name in [n for n in vars(self._app) if n.startswith("draw_")]:
+            delattr(self._app, name)
+        frames = max(1, self.frame - self.start_frame)
+        path = os.path.join(self.directory, "frames_draw.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"{frames} cuadros (tiempos inclusivos)\n")
+            f.write(f"{'método':<32}{'llamadas':>10}{'total (ms)':>12}{'ms/cuadro':>11}\n")
+            for name, total in sorted(self._draw_times.items(), key=lambda kv: -kv[1]):
+                f.write(f"{name:<32}{self._draw_calls[name]:>10}{total * 1000:>12.1f}"
+                        f"{total * 1000 / frames:>11.2f}\n")
+        print(f"[perfil] ventana de cuadros guardada en {self.directory}")
+
+    def close(self) -> None:
+        """Cierra la ventana de cuadros si la sesión termina a mitad."""
+        self._end_window()
+
+    # ---------------------------
+    # Llamadas a la IA
+    # ---------------------------
+
+    @contextmanager
+    def ai_call(self) -> Iterator[None]:
+        """Perfila por separado una llamada a choose_ai_move (en su propio hilo)."""
+        if not self.profile_ai:
+            yield
+            return
+        with self._lock:
+            self.ai_calls += 1
+            name = f"ai-{self.ai_calls:03d}"
+        t0 = time.perf_counter()
+        with _profiled(self.directory, name):
+            yield
+        print(f"[perfil] {name}: {(time.perf_counter() - t0) * 1000:.1f} ms -> "
+              f"{os.path.join(self.directory, name)}")
+
+
+_session: Optional[ProfileSession] = None
+
+
+def enabled_from_env() -> bool:
+    return os.environ.get(ENV_VAR, "") not in ("", "0")
+
+
+def start_session(start_frame: Optional[int] = None, frames: Optional[int] = None) -> ProfileSession:
+    """Abre la sesión global (la que usan la GUI y la IA)."""
+    global _session
+    _session = ProfileSession(
+        config.PROFILE_START_FRAME if start_frame is None else start_frame,
+        config.PROFILE_FRAMES if frames is None else frames,
+        config.PROFILE_AI,
+    )
+    return _session
+
+
+def get_session() -> Optional[ProfileSession]:
+    return _session
+
+
+@contextmanager
+def profile_ai_call() -> Iterator[None]:
+    """Perfila la llamada a la IA del bloque si hay una sesión abierta."""
+    if _session is None:
+        yield
+    else:
+        with _session.ai_call():
+            yield
+
+
+def main() -> None:
+    from ai_minimax import set_transposition_table
+    from benchmarks.positions import build_corpus, load_corpus
+    from engines import choose_ai_move
+    from transposition import TranspositionTable
+
+    parser = argparse.ArgumentParser(description="Perfila choose_ai_move sobre posiciones fijas")
+    parser.add_argument("--depth", type=int, default=config.MINIMAX_DEPTH)
+    parser.add_argument("--positions", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--position", action="append", metavar="POSICIÓN|ARCHIVO",
+                        help="posición en notación (o archivo de posiciones) en lugar del corpus")
+    args = parser.parse_args()
+
+    try:
+        corpus = (load_corpus(args.position) if args.position
+                  else build_corpus(args.positions, seed=args.seed))
+    except ValueError as exc:
+        parser.error(str(exc))
+    config.MINIMAX_DEPTH = args.depth
+    config.AI_TIME_BUDGET_MS = 0
+    session = ProfileSession(profile_ai=True)
+    for name, state in corpus:
+        set_transposition_table(TranspositionTable(config.TT_MAX_MB))
+        print(f"{name}:")
+        with session.ai_call():
+            choose_ai_move(state, side=state.current_turn)
+    paths = [os.path.join(session.directory, f"ai-{i:03d}.prof")
+             for i in range(1, session.ai_calls + 1)]
+    print(top_functions([p for p in paths if os.path.exists(p)]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Partidas IA contra IA sin interfaz gráfica.
+
+Cada partida se crea con `create_initial_game_state` y se juega solo con las
+reglas de `GameState`; los dos bandos eligen con `choose_ai_move` del motor
+configurado. No importa pygame, así que sirve para medir el motor en
+cualquier máquina:
+
+    python main.py --headless --games 1000 --seed 42
+"""
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import config
+from engines import ChooseMove, get_engine
+from game_models import create_initial_game_state
+
+SIDES = ("player", "ai")
+
+
+@dataclass
+class GameResult:
+    seed: int
+    winner: str                  # "player", "ai" o "draw"
+    turns: int                   # cambios de turno hasta el final
+    moves: Dict[str, int]        # decisiones de cada bando (pasar incluido)
+    think_time: Dict[str, float] # segundos de cada bando dentro de choose_ai_move
+
+
+@dataclass
+class SimulationReport:
+    results: List[GameResult] = field(default_factory=list)
+    elapsed: float = 0.0         # segundos de reloj de toda la simulación
+
+    @property
+    def games(self) -> int:
+        return len(self.results)
+
+    @property
+    def games_per_second(self) -> float:
+        return self.games / self.elapsed if self.elapsed > 0 else 0.0
+
+    def win_rate(self, winner: str) -> float:
+        """Fracción de partidas que ganó `winner` ("player", "ai" o "draw")."""
+        if not self.results:
+            return 0.0
+        return sum(r.winner == winner for r in self.results) / self.games
+
+    @property
+    def avg_turns(self) -> float:
+        return sum(r.turns for r in self.results) / self.games if self.results else 0.0
+
+    @property
+    def ms_per_move(self) -> float:
+        moves = sum(sum(r.moves.values()) for r in self.results)
+        think_time = sum(sum(r.think_time.values()) for r in self.results)
+        return 1000 * think_time / moves if moves else 0.0
+
+
+def play_game(seed: int, max_turns: int = config.SIM_MAX_TURNS,
+              engines: Optional[Dict[str, str]] = None,
+              players: Optional[Dict[str, ChooseMove]] = None) -> GameResult:
+    """Juega una partida completa con la semilla `seed`.
+
+    `engines` puede asignar un motor distinto a cada bando
+    ({"player": "mcts"}); por defecto ambos usan config.AI_ENGINE. `players`
+    sustituye directamente la función que elige por cada bando (misma firma
+    que choose_ai_move). Si se llega a `max_turns` sin terminar, la partida
+    cuenta como empate.
+    """
+    random.seed(seed)
+    state = create_initial_game_state()
+    choose = players or {side: get_engine((engines or {}).get(side)) for side in SIDES}
+    moves = dict.fromkeys(SIDES, 0)
+    think_time = dict.fromkeys(SIDES, 0.0)
+    while not state.finished and state.turn_count < max_turns:
+        side = state.current_turn
+        t0 = time.perf_counter()
+        move = choose[side](state, side=side)
+        think_time[side] += time.perf_counter() - t0
+        moves[side] += 1
+        if move is None:
+            state.pass_turn()
+        else:
+            state.apply_move(move)
+    winner = state.winner if state.finished and state.winner else "draw"
+    return GameResult(seed, winner, state.turn_count, moves, think_time)
+
+
+def simulate(games: int = config.SIM_GAMES, seed: int = 0,
+             max_turns: int = config.SIM_MAX_TURNS,
+             engines: Optional[Dict[str, str]] = None) -> SimulationReport:
+    """Juega `games` partidas con semillas seed, seed+1, ..."""
+    report = SimulationReport()
+    t0 = time.perf_counter()
+    for i in range(games):
+        report.results.append(play_game(seed + i, max_turns, engines))
+    report.elapsed = time.perf_counter() - t0
+    return report
+
+
+def format_report(report: SimulationReport) -> str:
+    return "\n".join([
+        f"Partidas:            {report.games} en {report.elapsed:.1f} s "
+        f"({report.games_per_second:.2f} partidas/s)",
+        f"Victorias Jugador:   {report.win_rate('player'):.1%}",
+        f"Victorias IA:        {report.win_rate('ai'):.1%}",
+        f"Empates:             {report.win_rate('draw'):.1%}",
+        f"Turnos por partida:  {report.avg_turns:.1f}",
+        f"Tiempo por jugada:   {report.ms_per_move:.2f} ms",
+    ])
@@ -0,0 +1,54 @@
+"""
+`config.AI_DEDUP_MOVES` no cambia el resultado de la búsqueda.
+
+Alfa-beta descartando jugadas equivalentes debe devolver el mismo (valor,
+jugada) que minimax sin poda y que alfa-beta sin descartarlas. Con mazos de
+más de 80 cartas hay cartas repetidas, así que sí se descartan jugadas.
+"""
+import pytest
+
+import config
+from ai_minimax import alphabeta, minimax
+from benchmarks.positions import build_positions
+
+POSITIONS = 20
+SIDES = ("player", "ai")
+
+
+@pytest.fixture(scope="module", params=[config.DECK_SIZE, 120], ids=lambda n: f"mazo{n}")
+def positions(request):
+    saved = config.DECK_SIZE
+    config.DECK_SIZE = request.param
+    try:
+        yield build_positions(POSITIONS, seed=42)
+    finally:
+        config.DECK_SIZE = saved
+
+
+def _alphabeta(state, depth, side, dedup, monkeypatch):
+    monkeypatch.setattr(config, "AI_DEDUP_MOVES", dedup)
+    return alphabeta(state, depth, side)
+
+
+@pytest.mark.parametrize("depth", [1, 2, 3])
+def test_same_result_as_minimax(positions, depth, monkeypatch):
+    for state in positions:
+        for side in SIDES:
+            expected = minimax(state, depth, side)
+            assert _alphabeta(state, depth, side, True, monkeypatch) == expected
+
+
+@pytest.mark.parametrize("depth", [1, 2, 3, 4])
+def test_same_result_without_dedup(positions, depth, monkeypatch):
+    for state in positions:
+        for side in SIDES:
+            expected = _alphabeta(state, depth, side, False, monkeypatch)
+            assert _alphabeta(state, depth, side, True, monkeypatch) == expected
+
+
+def test_duplicates_are_removed(positions):
+    # Sin jugadas repetidas la prueba no demostraría nada con el mazo grande
+    if config.DECK_SIZE <= 80:
+        pytest.skip("con el mazo por defecto no hay cartas repetidas")
+    assert any(len(list(s.distinct(s.valid_moves_packed()))) < len(s.valid_moves_packed())
+               for s in positions)
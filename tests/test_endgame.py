@@ -0,0 +1,74 @@
+"""
+El resolvedor de finales respeta el tiempo por turno y la cancelación.
+"""
+import threading
+import time
+
+import pytest
+
+import ai_minimax
+import config
+from ai_minimax import SearchCancelled, SearchStats, choose_ai_move
+from endgame import EndgameTooLarge, solve_endgame
+from notation import decode_position
+
+# Campo lleno y manos de cinco cartas: demasiado para resolverlo en décimas de segundo
+BUSY = "a 30 8000/*/62.66.9.12.13/36.47.68.20.44/- 8000/*/41.45.54.14.15/42.59.11.33.53/- -"
+# Pocas cartas: se resuelve enseguida
+SMALL = "a 30 1500/*/62/36._._._._/- 1200/*/41/42._._._._/- -"
+
+# Margen para el reloj: las comprobaciones se hacen cada cierto número de nodos
+SLACK = 0.1
+
+
+@pytest.fixture(autouse=True)
+def endgame_config(monkeypatch):
+    # Cualquier posición pasa por el resolvedor y solo lo limita el tiempo
+    monkeypatch.setattr(config, "ENDGAME_SOLVER", True)
+    monkeypatch.setattr(config, "ENDGAME_THRESHOLD", 100)
+    monkeypatch.setattr(config, "ENDGAME_MAX_NODES", 10 ** 9)
+    monkeypatch.setattr(config, "AI_SEARCH_MODE", "alphabeta")
+    monkeypatch.setattr(ai_minimax, "_endgame_failures", set())
+
+
+def test_solver_stops_at_deadline():
+    t0 = time.perf_counter()
+    with pytest.raises(EndgameTooLarge):
+        solve_endgame(decode_position(BUSY), "ai", 10 ** 9, deadline=t0 + 0.1)
+    assert time.perf_counter() - t0 < 0.1 + SLACK
+
+
+def test_choose_ai_move_keeps_time_budget(monkeypatch):
+    monkeypatch.setattr(config, "AI_TIME_BUDGET_MS", 200)
+    state = decode_position(BUSY)
+    for _ in range(2):
+        stats = SearchStats()
+        t0 = time.perf_counter()
+        move = choose_ai_move(state, stats=stats)
+        assert time.perf_counter() - t0 < 0.2 + SLACK
+        assert move is not None and stats.mode == "alphabeta"
+
+
+def test_failed_position_is_not_retried(monkeypatch):
+    monkeypatch.setattr(config, "AI_TIME_BUDGET_MS", 0)
+    monkeypatch.setattr(config, "MINIMAX_DEPTH", 2)
+    monkeypatch.setattr(config, "ENDGAME_MAX_MS", 50)
+    state = decode_position(BUSY)
+    choose_ai_move(state)
+    assert len(ai_minimax._endgame_failures) == 1
+    t0 = time.perf_counter()
+    choose_ai_move(state)
+    assert time.perf_counter() - t0 < 0.05
+
+
+def test_solver_can_be_cancelled():
+    stop = threading.Event()
+    stop.set()
+    with pytest.raises(SearchCancelled):
+        choose_ai_move(decode_position(BUSY), stop_event=stop)
+
+
+def test_small_endgame_is_solved():
+    stats = SearchStats()
+    assert choose_ai_move(decode_position(SMALL), stats=stats) is not None
+    assert stats.mode == "endgame"
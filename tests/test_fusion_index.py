@@ -0,0 +1,42 @@
+"""
+FusionIndex mantiene `partners` al día con cualquier método de dict.
+"""
+import pickle
+
+from game_models import FusionIndex
+
+
+def _assert_consistent(fusions):
+    expected = FusionIndex(dict(fusions))
+    assert fusions.partners == expected.partners
+    assert all(c1 <= c2 for c1, c2 in fusions)
+
+
+def test_updates_keep_partners_in_sync():
+    fusions = FusionIndex({(1, 2): 3})
+    fusions.update({(5, 4): 6})
+    assert fusions.result(4, 5) == 6 and (4, 5) in fusions
+    fusions |= [((9, 8), 10)]
+    assert fusions.setdefault((2, 1), 99) == 3
+    assert fusions.setdefault((7, 6), 11) == 11
+    _assert_consistent(fusions)
+
+    assert fusions.pop((5, 4)) == 6 and fusions.result(4, 5) is None
+    del fusions[2, 1]
+    fusions[3, 3] = 4
+    del fusions[3, 3]
+    fusions.popitem()
+    _assert_consistent(fusions)
+
+    merged = fusions | {(13, 12): 14}
+    assert isinstance(merged, FusionIndex) and merged.result(12, 13) == 14
+    assert fusions.result(12, 13) is None
+    fusions.clear()
+    assert not fusions.partners
+
+
+def test_copy_and_pickle_keep_the_index():
+    fusions = FusionIndex({(2, 1): 3, (4, 4): 5})
+    for other in (fusions.copy(), pickle.loads(pickle.dumps(fusions))):
+        assert isinstance(other, FusionIndex)
+        assert other == fusions and other.partners == fusions.partners
@@ -0,0 +1,93 @@
+"""
+Ida y vuelta de la notación de posiciones (texto y binaria).
+"""
+import random
+
+import pytest
+
+import config
+from game_models import create_initial_game_state
+from notation import decode_position, encode_position, pack_position, unpack_position
+
+GAMES = 10
+
+
+def _assert_round_trip(state):
+    text = encode_position(state)
+    data = pack_position(state)
+    for decoded in (decode_position(text, state.cards, state.fusions, state.combat),
+                    unpack_position(data, state.cards, state.fusions, state.combat)):
+        assert decoded == state, text
+        assert decoded.zobrist_hash() == state.zobrist_hash()
+        assert decoded.canonical_hash() == state.canonical_hash()
+        assert encode_position(decoded) == text
+        assert pack_position(decoded) == data
+
+
+def _played_states(deck_size, seed):
+    """Estados de una partida con jugadas al azar (semilla fija), hasta el final."""
+    saved = config.DECK_SIZE
+    config.DECK_SIZE = deck_size
+    try:
+        random.seed(seed)
+        state = create_initial_game_state()
+    finally:
+        config.DECK_SIZE = saved
+    rnd = random.Random(seed)
+    while True:
+        yield state
+        if state.finished:
+            return
+        moves = state.valid_moves_packed()
+        if moves:
+            state.apply_packed(rnd.choice(moves))
+        else:
+            state.pass_turn()
+
+
+@pytest.mark.parametrize("deck_size", [config.DECK_SIZE, 120])
+def test_round_trip_every_ply(deck_size):
+    finished = negative_lp = empty_deck = 0
+    for seed in range(GAMES):
+        for state in _played_states(deck_size, seed):
+            _assert_round_trip(state)
+            finished += state.finished
+            negative_lp += any(p.life_points < 0 for p in (state.player, state.ai))
+            empty_deck += any(p.cards_left == 0 for p in (state.player, state.ai))
+    # Las partidas deben haber pasado por los casos límite
+    assert finished == GAMES and negative_lp > 0
+    if deck_size == config.DECK_SIZE:
+        assert empty_deck > 0
+
+
+@pytest.mark.parametrize("position", [
+    "p 7 -350/1.2*/-/_._._._._/- 2000/*3/-/4._._._._/5.6 a",   # terminada, LP negativos
+    "a 0 8000/*/-/_._._._._/- 8000/*/-/_._._._._/- -",         # sin cartas en ningún sitio
+    "p 3 100/*9/-/_.7._.8._/2 0/*/1/_._._._._/- d",            # tablas, mano vacía
+])
+def test_round_trip_edge_positions(position):
+    state = decode_position(position)
+    assert encode_position(state) == position
+    _assert_round_trip(state)
+
+
+@pytest.mark.parametrize("position", [
+    "",
+    "p 0 8000/*1/-/_._._._._/-",                               # falta un campo
+    "p 0 8000/1/-/_._._._._/- 8000/*2/-/_._._._._/- -",       # mazo sin '*'
+    "p 0 8000/*1/-/-._._._._/- 8000/*2/-/_._._._._/- -",      # casilla '-'
+    "p 0 8000/*1/-/._._._._/- 8000/*2/-/_._._._._/- -",       # casilla vacía
+    "p 0 8000/*1/-/_._._._/- 8000/*2/-/_._._._._/- -",        # cuatro casillas
+    "p 0 8000/*99999/-/_._._._._/- 8000/*2/-/_._._._._/- -",  # carta desconocida
+    "x 0 8000/*1/-/_._._._._/- 8000/*2/-/_._._._._/- -",      # turno no válido
+])
+def test_invalid_text_raises_value_error(position):
+    with pytest.raises(ValueError):
+        decode_position(position)
+
+
+def test_invalid_binary_raises_value_error():
+    data = pack_position(decode_position("p 0 8000/1*2/3/4._._._._/- 8000/*5/6/_._._._._/7 -"))
+    for bad in (data[:-1], data[:5], data + b"\0", b"XX" + data[2:]):
+        with pytest.raises(ValueError):
+            unpack_position(bad)
@@ -0,0 +1,39 @@
+"""
+FrozenGameState sigue las mismas reglas y el mismo hash que GameState.
+"""
+import random
+
+import pytest
+
+import config
+from game_models import create_initial_game_state
+from persistent_state import FrozenGameState
+
+GAMES = 10
+
+
+@pytest.mark.parametrize("deck_size", [config.DECK_SIZE, 120])
+def test_same_game_as_mutable_state(deck_size, monkeypatch):
+    monkeypatch.setattr(config, "DECK_SIZE", deck_size)
+    for seed in range(GAMES):
+        random.seed(seed)
+        state = create_initial_game_state()
+        frozen = FrozenGameState.freeze(state)
+        rnd = random.Random(seed)
+        while True:
+            assert frozen.thaw() == state
+            assert frozen.zobrist_hash() == state.zobrist_hash()
+            moves = state.valid_moves_packed()
+            assert frozen.valid_moves_packed() == moves
+            if state.finished:
+                break
+            if moves:
+                move = rnd.choice(moves)
+                previous = frozen
+                state.apply_packed(move)
+                frozen = frozen.apply_packed(move)
+                # El estado anterior no cambia
+                assert previous.valid_moves_packed() == moves
+            else:
+                state.pass_turn()
+                frozen = frozen.pass_turn()
@@ -0,0 +1,293 @@
+"""
+Torneo entre configuraciones de la IA, repartido entre todos los núcleos.
+
+Cada configuración es un nombre y unos valores de config.py que se aplican
+solo mientras juega ella:
+
+    python tournament.py --config d2:depth=2 --config d3:depth=3 \\
+        --config atk2:depth=2,AI_EVAL_ATK_WEIGHT=2 --games 1000 --seed 42
+
+Todas las parejas juegan `--games` partidas (simulator.play_game): cada
+semilla se juega dos veces cambiando de bando, porque el jugador empieza.
+Al final se muestra el Elo de cada configuración (máxima verosimilitud de
+Bradley-Terry, media 0), porcentajes de victorias/empates/derrotas con
+intervalos de confianza del 95 % y el tiempo medio por jugada.
+"""
+import argparse
+import ast
+import math
+import multiprocessing
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from itertools import combinations
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import ai_minimax
+import config
+from engines import get_engine
+from simulator import play_game
+from transposition import TranspositionTable
+
+# Nombres cortos para las opciones más habituales
+ALIASES = {
+    "depth": "MINIMAX_DEPTH",
+    "mode": "AI_SEARCH_MODE",
+    "engine": "AI_ENGINE",
+    "time": "AI_TIME_BUDGET_MS",
+    "lp": "AI_EVAL_LP_WEIGHT",
+    "atk": "AI_EVAL_ATK_WEIGHT",
+}
+
+Z_95 = 1.96
+
+
+@dataclass
+class EngineConfig:
+    name: str
+    overrides: Dict[str, Any] = field(default_factory=dict)
+
+    @staticmethod
+    def parse(spec: str) -> "EngineConfig":
+        """'nombre:CLAVE=valor,CLAVE=valor' (claves de config.py o de ALIASES)."""
+        name, _, body = spec.partition(":")
+        if not name:
+            raise ValueError(f"Configuración sin nombre: {spec!r}")
+        overrides: Dict[str, Any] = {}
+        for item in filter(None, body.split(",")):
+            key, sep, raw = item.partition("=")
+            key = ALIASES.get(key.strip(), key.strip())
+            if not sep or not key.isupper() or not hasattr(config, key):
+                raise ValueError(f"Opción desconocida en {spec!r}: {item!r}")
+            try:
+                overrides[key] = ast.literal_eval(raw.strip())
+            except (ValueError, SyntaxError):
+                overrides[key] = raw.strip()
+        if overrides.get("AI_SEARCH_MODE", config.AI_SEARCH_MODE) == "parallel":
+            raise ValueError(f"{name}: el modo 'parallel' no se puede usar dentro del torneo "
+                             "(cada partida ya corre en su propio proceso)")
+        get_engine(overrides.get("AI_ENGINE"))  # valida el motor antes de lanzar el pool
+        return EngineConfig(name, overrides)
+
+
+@dataclass
+class Standing:
+    """Resultados acumulados de una configuración."""
+    wins: int = 0
+    draws: int = 0
+    losses: int = 0
+    moves: int = 0
+    think_time: float = 0.0
+
+    @property
+    def games(self) -> int:
+        return self.wins + self.draws + self.losses
+
+    @property
+    def score(self) -> float:
+        """Puntos por partida (victoria 1, empate 0,5)."""
+        return (self.wins + 0.5 * self.draws) / self.games if self.games else 0.0
+
+    @property
+    def score_margin(self) -> float:
+        """Semiamplitud del intervalo del 95 % de `score`."""
+        n = self.games
+        if n < 2:
+            return 0.0
+        s = self.score
+        var = (self.wins * (1 - s) ** 2 + self.draws * (0.5 - s) ** 2
+               + self.losses * s ** 2) / (n - 1)
+        return Z_95 * math.sqrt(var / n)
+
+    @property
+    def ms_per_move(self) -> float:
+        return 1000 * self.think_time / self.moves if self.moves else 0.0
+
+
+def rate_margin(count: int, n: int) -> float:
+    """Semiamplitud del intervalo de Wilson del 95 % para count/n."""
+    if n == 0:
+        return 0.0
+    p = count / n
+    z2 = Z_95 ** 2
+    return Z_95 * math.sqrt(p * (1 - p) / n + z2 / (4 * n * n)) / (1 + z2 / n)
+
+
+def elo_ratings(count: int, games: List[Tuple[int, int, float]],
+                iterations: int = 1000) -> List[float]:
+    """Elo de máxima verosimilitud (Bradley-Terry) con media 0.
+
+    `games` son tuplas (i, j, puntos de i). Se añade un empate virtual por
+    pareja para que una configuración que gana o pierde todo tenga un valor
+    finito. Se resuelve con el algoritmo MM de Hunter.
+    """
+    points = [0.0] * count
+    pairs: Dict[Tuple[int, int], int] = {}
+    for i, j, s in games:
+        points[i] += s
+        points[j] += 1 - s
+        key = (min(i, j), max(i, j))
+        pairs[key] = pairs.get(key, 0) + 1
+    for i, j in pairs:
+        points[i] += 0.5
+        points[j] += 0.5
+        pairs[i, j] += 1
+
+    gamma = [1.0] * count
+    for _ in range(iterations):
+        denom = [0.0] * count
+        for (i, j), n in pairs.items():
+            d = n / (gamma[i] + gamma[j])
+            denom[i] += d
+            denom[j] += d
+        new = [points[i] / denom[i] if denom[i] else gamma[i] for i in range(count)]
+        scale = math.exp(sum(math.log(g) for g in new) / count)
+        new = [g / scale for g in new]
+        converged = max(abs(a - b) for a, b in zip(new, gamma)) < 1e-10
+        gamma = new
+        if converged:
+            break
+    return [400 * math.log10(g) for g in gamma]
+
+
+# ---------------------------
+# Procesos del pool
+# ---------------------------
+
+_engines: List[EngineConfig] = []
+# Tabla de transposición de cada configuración en este proceso: los valores
+# dependen de la evaluación y no se pueden compartir entre configuraciones
+_tables: Dict[str, Optional[TranspositionTable]] = {}
+
+
+def _init_worker(engines: List[EngineConfig]) -> None:
+    global _engines
+    _engines = engines
+    _tables.clear()
+
+
+@contextmanager
+def _configured(engine: EngineConfig) -> Iterator[None]:
+    """Aplica los valores de `engine` a config (y su tabla) mientras dura el bloque."""
+    saved = {key: getattr(config, key) for key in engine.overrides}
+    for key, value in engine.overrides.items():
+        setattr(config, key, value)
+    previous = ai_minimax.set_transposition_table(_tables.get(engine.name))
+    try:
+        yield
+    finally:
+        _tables[engine.name] = ai_minimax.set_transposition_table(previous)
+        for key, value in saved.items():
+            setattr(config, key, value)
+
+
+def _player(engine: EngineConfig):
+    def choose(state, stop_event=None, side="ai"):
+        with _configured(engine):
+            return get_engine()(state, stop_event=stop_event, side=side)
+    return choose
+
+
+def _play(task: Tuple[int, int, int, bool, int]) -> Tuple[int, int, float, Dict[int, int],
+                                                         Dict[int, float]]:
+    """Juega una partida de `task` = (i, j, semilla, i juega como "ai", máx. turnos).
+
+    Devuelve (i, j, puntos de i, jugadas por configuración, tiempo por configuración).
+    """
+    i, j, seed, i_is_ai, max_turns = task
+    side_of = {i: "ai", j: "player"} if i_is_ai else {i: "player", j: "ai"}
+    players = {side: _player(_engines[k]) for k, side in side_of.items()}
+    result = play_game(seed, max_turns, players=players)
+    if result.winner == "draw":
+        score = 0.5
+    else:
+        score = 1.0 if result.winner == side_of[i] else 0.0
+    return (i, j, score, {k: result.moves[side] for k, side in side_of.items()},
+            {k: result.think_time[side] for k, side in side_of.items()})
+
+
+# ---------------------------
+# Torneo
+# ---------------------------
+
+def run_tournament(engines: List[EngineConfig], games: int, seed: int = 0,
+                   max_turns: int = config.SIM_MAX_TURNS,
+                   workers: int = 0) -> Tuple[List[Standing], List[float], float]:
+    """Todas contra todas, `games` partidas por pareja.
+
+    Devuelve (resultados por configuración, Elo por configuración, segundos).
+    """
+    tasks = [(i, j, seed + g // 2, g % 2 == 1, max_turns)
+             for i, j in combinations(range(len(engines)), 2)
+             for g in range(games)]
+    workers = workers or os.cpu_count() or 1
+    standings = [Standing() for _ in engines]
+    played: List[Tuple[int, int, float]] = []
+    t0 = time.perf_counter()
+    with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(engines,)) as pool:
+        chunksize = max(1, len(tasks) // (workers * 16))
+        for i, j, score, moves, think_time in pool.imap_unordered(_play, tasks, chunksize):
+            played.append((i, j, score))
+            for k, s in ((i, score), (j, 1 - score)):
+                st = standings[k]
+                if s == 1:
+                    st.wins += 1
+                elif s == 0:
+                    st.losses += 1
+                else:
+                    st.draws += 1
+                st.moves += moves[k]
+                st.think_time += think_time[k]
+    elapsed = time.perf_counter() - t0
+    return standings, elo_ratings(len(engines), played), elapsed
+
+
+def format_standings(engines: List[EngineConfig], standings: List[Standing],
+                     elo: List[float]) -> str:
+    lines = [f"{'configuración':<16}{'partidas':>9}{'Elo':>8}{'±95%':>7}"
+             f"{'victorias':>16}{'empates':>15}{'derrotas':>15}{'puntos':>15}{'ms/jugada':>11}"]
+    for k in sorted(range(len(engines)), key=lambda k: -elo[k]):
+        st = standings[k]
+        n = st.games
+        # Intervalo del Elo a partir del de la puntuación (derivada de la curva logística)
+        s = min(max(st.score, 0.01), 0.99)
+        elo_margin = st.score_margin * 400 / (math.log(10) * s * (1 - s))
+        rates = [f"{c / n if n else 0:>8.1%} ±{rate_margin(c, n):<5.1%}"
+                 for c in (st.wins, st.draws, st.losses)]
+        lines.append(f"{engines[k].name:<16}{n:>9}{elo[k]:>8.0f}{elo_margin:>7.0f}"
+                     f"{rates[0]:>16}{rates[1]:>15}{rates[2]:>15}"
+                     f"{st.score:>8.1%} ±{st.score_margin:<5.1%}{st.ms_per_move:>11.2f}")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--config", action="append", dest="configs", metavar="NOMBRE:CLAVE=VALOR,...",
+                        help="configuración participante (repetible; por defecto profundidades 1, 2 y 3)")
+    parser.add_argument("--games", type=int, default=config.SIM_GAMES,
+                        help="partidas por pareja de configuraciones")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-turns", type=int, default=config.SIM_MAX_TURNS)
+    parser.add_argument("--workers", type=int, default=0, help="procesos (0 = todos los núcleos)")
+    args = parser.parse_args()
+
+    specs = args.configs or ["d1:depth=1", "d2:depth=2", "d3:depth=3"]
+    try:
+        engines = [EngineConfig.parse(spec) for spec in specs]
+    except ValueError as exc:
+        parser.error(str(exc))
+    if len(engines) < 2:
+        parser.error("hacen falta al menos dos configuraciones")
+    if len({e.name for e in engines}) != len(engines):
+        parser.error("los nombres de las configuraciones deben ser distintos")
+
+    standings, elo, elapsed = run_tournament(engines, args.games, args.seed,
+                                             args.max_turns, args.workers)
+    total = sum(st.games for st in standings) // 2
+    print(f"{total} partidas en {elapsed:.1f} s ({total / elapsed:.1f} partidas/s)")
+    print(format_standings(engines, standings, elo))
+
+
+if __name__ == "__main__":
+    main()
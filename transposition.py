@@ -0,0 +1,95 @@
+"""
+Tabla de transposición para la búsqueda de la IA.
+
+Guarda, por hash de Zobrist, el resultado de subárboles ya buscados para que
+un mismo GameState alcanzado por distintos órdenes de jugadas cueste una
+consulta en lugar de una nueva expansión.
+"""
+import sys
+from typing import List, Optional, Tuple
+
+# Tipo de valor guardado
+EXACT = 0   # valor exacto
+LOWER = 1   # cota inferior (hubo poda beta)
+UPPER = 2   # cota superior (ninguna jugada superó alfa)
+
+# (key, depth, value, flag, move, generation)
+Entry = Tuple[int, int, float, int, object, int]
+
+
+def _entry_bytes() -> int:
+    """Bytes de una entrada típica: la tupla, los enteros propios de cada
+    entrada (clave de 64 bits, valor en el rango de los LP, jugada con ids de
+    carta) y su casilla en la lista. Profundidad, tipo y generación son enteros
+    pequeños que Python comparte."""
+    key, value, move = (1 << 64) - 1, 3 * 8000, (1 << 34) - 1
+    entry = (key, 4, value, EXACT, move, 1)
+    return (sys.getsizeof(entry) + sys.getsizeof(key) + sys.getsizeof(value)
+            + sys.getsizeof(move) + 8)
+
+
+# Tamaño de una entrada en bytes (≈ 190 en CPython de 64 bits)
+ENTRY_BYTES = _entry_bytes()
+
+
+class TranspositionTable:
+    """Tabla acotada de cubetas de 2 entradas.
+
+    Política de reemplazo en cada cubeta:
+      - la entrada 0 prefiere profundidad: solo se reemplaza por una búsqueda
+        igual o más profunda, o si viene de una búsqueda anterior;
+      - la entrada 1 siempre se reemplaza.
+    """
+
+    def __init__(self, max_mb: float) -> None:
+        max_entries = max(2, int(max_mb * 1024 * 1024) // ENTRY_BYTES)
+        buckets = 1
+        while buckets * 4 <= max_entries:
+            buckets *= 2
+        self._mask = buckets - 1
+        self._slots: List[Optional[Entry]] = [None] * (buckets * 2)
+        self.generation = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    def __len__(self) -> int:
+        return sum(1 for e in self._slots if e is not None)
+
+    @property
+    def capacity(self) -> int:
+        return len(self._slots)
+
+    def new_search(self) -> None:
+        """Marca el inicio de una búsqueda: las entradas viejas pasan a ser reemplazables."""
+        self.generation += 1
+
+    def clear(self) -> None:
+        self._slots = [None] * len(self._slots)
+        self.probes = self.hits = self.stores = 0
+
+    def probe(self, key: int) -> Optional[Entry]:
+        self.probes += 1
+        i = (key & self._mask) << 1
+        slots = self._slots
+        e = slots[i]
+        if e is not None and e[0] == key:
+            self.hits += 1
+            return e
+        e = slots[i + 1]
+        if e is not None and e[0] == key:
+            self.hits += 1
+            return e
+        return None
+
+    def store(self, key: int, depth: int, value: float, flag: int, move: object) -> None:
+        self.stores += 1
+        i = (key & self._mask) << 1
+        slots = self._slots
+        entry = (key, depth, value, flag, move, self.generation)
+        old = slots[i]
+        if (old is None or old[0] == key or depth >= old[1]
+                or old[5] != self.generation):
+            slots[i] = entry
+        else:
+            slots[i + 1] = entry